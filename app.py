@@ -6,9 +6,18 @@ AI Coach lives in the sidebar so it's always one click away.
 
 from __future__ import annotations
 
+import atexit
+import functools
+import hashlib
+import hmac
 import os
+import re
+import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, fields as dc_fields
+from datetime import date as _date
+from html import escape as _esc
 
 import streamlit as st
 
@@ -24,8 +33,21 @@ st.set_page_config(
 # Global CSS — premium dark aurora theme
 # ─────────────────────────────────────────────────────────────────────────────
 
-st.markdown(
-    """
+# Bump when the stylesheet changes so cached copies are invalidated.
+_CSS_VERSION = "0.3.4"
+
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};])\s*")
+
+
+def _minify_css(css: str) -> str:
+    """Strip comments and collapse whitespace — the sheets are resent every rerun."""
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _CSS_SPACE_RE.sub(" ", css)
+    return _CSS_PUNCT_RE.sub(r"\1", css).strip()
+
+_CSS = """
 <style>
 /* ─────────────────────────────────────────────────────────────────────────── */
 /* Fonts                                                                       */
@@ -46,6 +68,16 @@ html, body, [class*="css"], .stApp {
     -webkit-font-smoothing: antialiased !important;
 }
 
+/* Form controls don't inherit font-family — one grouped rule instead of one per widget */
+[data-testid="stTabs"] [data-baseweb="tab"],
+button[kind="primary"],
+[data-testid="stButton"] > button[kind="secondary"],
+[data-testid="stFormSubmitButton"] > button,
+[data-testid="stTextInput"] input,
+[data-testid="stTextArea"] textarea,
+input[type="number"],
+[data-testid="stNumberInput"] input { font-family: 'Inter', sans-serif !important; }
+
 /* ── App background ─────────────────────────────────────────────────────── */
 .stApp {
     background: radial-gradient(ellipse at 20% 20%, #0f1729 0%, #080c14 45%, #0a0f1e 100%) !important;
@@ -63,14 +95,6 @@ html, body, [class*="css"], .stApp {
 [data-testid="stSidebar"] > div:first-child { padding-top: 1rem; }
 [data-testid="stSidebar"] section[data-testid="stSidebarContent"] { overflow-y: auto; }
 
-/* ── Sidebar scrollbar ──────────────────────────────────────────────────── */
-[data-testid="stSidebar"] ::-webkit-scrollbar { width: 3px; }
-[data-testid="stSidebar"] ::-webkit-scrollbar-track { background: transparent; }
-[data-testid="stSidebar"] ::-webkit-scrollbar-thumb {
-    background: rgba(129, 140, 248, 0.35);
-    border-radius: 10px;
-}
-
 /* ── Tabs ───────────────────────────────────────────────────────────────── */
 [data-testid="stTabs"] [data-baseweb="tab-list"] {
     background: transparent !important;
@@ -80,13 +104,12 @@ html, body, [class*="css"], .stApp {
 [data-testid="stTabs"] [data-baseweb="tab"] {
     background: transparent !important;
     color: rgba(148, 163, 184, 0.6) !important;
-    font-family: 'Inter', sans-serif !important;
     font-weight: 500 !important;
     font-size: 0.9rem !important;
     padding: 0.7rem 1.6rem !important;
     border: none !important;
     border-bottom: 2px solid transparent !important;
-    transition: all 0.2s ease !important;
+    transition: color 0.2s ease, background-color 0.2s ease !important;
     letter-spacing: 0.01em !important;
 }
 [data-testid="stTabs"] [aria-selected="true"] {
@@ -105,18 +128,17 @@ button[kind="primary"], [data-testid="stButton"] > button[kind="primary"] {
     color: #fff !important;
     border: none !important;
     border-radius: 10px !important;
-    font-family: 'Inter', sans-serif !important;
     font-weight: 600 !important;
     font-size: 0.88rem !important;
     letter-spacing: 0.02em !important;
     padding: 0.55rem 1.2rem !important;
     box-shadow: 0 0 18px rgba(99, 102, 241, 0.35), 0 2px 8px rgba(0,0,0,0.4) !important;
-    transition: all 0.22s ease !important;
+    transition: transform 0.15s ease, box-shadow 0.15s ease, filter 0.15s ease !important;
 }
 button[kind="primary"]:hover, [data-testid="stButton"] > button[kind="primary"]:hover {
     box-shadow: 0 0 32px rgba(139, 92, 246, 0.6), 0 4px 16px rgba(0,0,0,0.5) !important;
     transform: translateY(-1px) !important;
-    background: linear-gradient(135deg, #7175f3 0%, #9b6cf8 100%) !important;
+    filter: brightness(1.08) !important;
 }
 button[kind="primary"]:disabled {
     opacity: 0.35 !important;
@@ -131,10 +153,9 @@ button[kind="primary"]:disabled {
     color: #a5b4fc !important;
     border: 1px solid rgba(99, 102, 241, 0.3) !important;
     border-radius: 9px !important;
-    font-family: 'Inter', sans-serif !important;
     font-weight: 500 !important;
     font-size: 0.85rem !important;
-    transition: all 0.2s ease !important;
+    transition: background-color 0.2s ease, border-color 0.2s ease, color 0.2s ease !important;
 }
 [data-testid="stButton"] > button[kind="secondary"]:hover,
 [data-testid="stFormSubmitButton"] > button:hover {
@@ -143,24 +164,34 @@ button[kind="primary"]:disabled {
     color: #c7d2fe !important;
 }
 
-/* ── Text / password inputs ─────────────────────────────────────────────── */
+/* ── Text / password / number inputs ────────────────────────────────────── */
 [data-testid="stTextInput"] input,
-[data-testid="stTextArea"] textarea {
+[data-testid="stTextArea"] textarea,
+input[type="number"],
+[data-testid="stNumberInput"] input {
     background: rgba(22, 34, 68, 0.95) !important;
     border: 1.5px solid rgba(99, 102, 241, 0.5) !important;
     border-radius: 9px !important;
     color: #f1f5f9 !important;
-    font-family: 'Inter', sans-serif !important;
-    font-size: 0.875rem !important;
     caret-color: #a5b4fc !important;
+}
+[data-testid="stTextInput"] input,
+[data-testid="stTextArea"] textarea {
+    font-size: 0.875rem !important;
     transition: border-color 0.2s ease, box-shadow 0.2s ease !important;
 }
 [data-testid="stTextInput"] input:focus,
-[data-testid="stTextArea"] textarea:focus {
+[data-testid="stTextArea"] textarea:focus,
+input[type="number"]:focus,
+[data-testid="stNumberInput"] input:focus {
     border-color: rgba(129, 140, 248, 0.85) !important;
-    box-shadow: 0 0 0 3px rgba(99, 102, 241, 0.22), 0 0 12px rgba(129, 140, 248, 0.15) !important;
+    box-shadow: 0 0 0 3px rgba(99, 102, 241, 0.22) !important;
     background: rgba(26, 40, 80, 0.98) !important;
 }
+[data-testid="stTextInput"] input:focus,
+[data-testid="stTextArea"] textarea:focus {
+    box-shadow: 0 0 0 3px rgba(99, 102, 241, 0.22), 0 0 12px rgba(129, 140, 248, 0.15) !important;
+}
 [data-testid="stTextInput"] input::selection,
 [data-testid="stTextArea"] textarea::selection {
     background: rgba(99, 102, 241, 0.45) !important;
@@ -241,33 +272,42 @@ hr {
     border-radius: 9px !important;
     font-weight: 500 !important;
     font-size: 0.85rem !important;
-    transition: all 0.2s ease !important;
+    transition: background-color 0.2s ease, border-color 0.2s ease, color 0.2s ease !important;
 }
 [data-testid="stDownloadButton"] button:hover {
     background: rgba(16, 185, 129, 0.2) !important;
     border-color: rgba(16, 185, 129, 0.5) !important;
 }
 
+/* ── Gradient text (logo, banner, headers, panel titles) ─────────────────── */
+.pf-grad {
+    background: linear-gradient(135deg, #818cf8 0%, #c084fc 100%);
+    -webkit-background-clip: text; -webkit-text-fill-color: transparent;
+    background-clip: text;
+}
+.pf-grad-soft { background-image: linear-gradient(135deg, #a5b4fc 0%, #c084fc 100%); }
+.pf-grad-hero { background-image: linear-gradient(135deg, #a5b4fc 0%, #c084fc 50%, #818cf8 100%); }
+.pf-grad-logo { background-image: linear-gradient(135deg, #818cf8 0%, #c084fc 60%, #818cf8 100%); }
+
 /* ── Chat message bubbles (sidebar) ─────────────────────────────────────── */
+.pf-msg-user, .pf-msg-assistant {
+    padding: 0.55rem 0.75rem;
+    font-size: 0.82rem;
+    line-height: 1.45;
+}
 .pf-msg-user {
     background: rgba(99, 102, 241, 0.18);
     border: 1px solid rgba(99, 102, 241, 0.25);
     border-radius: 10px 10px 3px 10px;
-    padding: 0.55rem 0.75rem;
     margin: 0.35rem 0 0.35rem 1.5rem;
     color: #e2e8f0;
-    font-size: 0.82rem;
-    line-height: 1.45;
 }
 .pf-msg-assistant {
     background: rgba(17, 24, 39, 0.8);
     border: 1px solid rgba(129, 140, 248, 0.15);
     border-radius: 10px 10px 10px 3px;
-    padding: 0.55rem 0.75rem;
     margin: 0.35rem 1.5rem 0.35rem 0;
     color: #cbd5e1;
-    font-size: 0.82rem;
-    line-height: 1.45;
 }
 .pf-msg-label {
     font-size: 0.68rem;
@@ -286,11 +326,6 @@ hr {
     padding: 0.25rem 0;
     margin-bottom: 0.5rem;
 }
-.pf-chat-history::-webkit-scrollbar { width: 3px; }
-.pf-chat-history::-webkit-scrollbar-thumb {
-    background: rgba(129, 140, 248, 0.3);
-    border-radius: 10px;
-}
 
 /* ── Markdown typography — full scale ───────────────────────────────────── */
 /*
@@ -301,13 +336,6 @@ hr {
    H4  1.125rem  → 18 px    lh 1.4
    p / li  1 rem → 16 px    lh 1.65
 */
-[data-testid="stMarkdown"] h1,
-[data-testid="stMarkdown"] h2,
-[data-testid="stMarkdown"] h3,
-[data-testid="stMarkdown"] h4 {
-    font-family: 'Space Grotesk', 'Inter', sans-serif !important;
-    letter-spacing: -0.02em !important;
-}
 [data-testid="stMarkdown"] h1 {
     font-size: 2.25rem !important;
     font-weight: 700 !important;
@@ -342,18 +370,14 @@ hr {
     margin-top: 1.2rem !important;
     margin-bottom: 0.3rem !important;
 }
-[data-testid="stMarkdown"] p {
-    font-size: 1rem !important;
-    line-height: 1.65 !important;
-    color: #cbd5e1 !important;
-    margin-bottom: 0.75rem !important;
-}
+[data-testid="stMarkdown"] p,
 [data-testid="stMarkdown"] li {
     font-size: 1rem !important;
     line-height: 1.65 !important;
     color: #cbd5e1 !important;
-    margin-bottom: 0.3rem !important;
 }
+[data-testid="stMarkdown"] p  { margin-bottom: 0.75rem !important; }
+[data-testid="stMarkdown"] li { margin-bottom: 0.3rem !important; }
 [data-testid="stMarkdown"] ul,
 [data-testid="stMarkdown"] ol { color: #cbd5e1 !important; padding-left: 1.4rem !important; }
 [data-testid="stMarkdown"] strong { color: #e2e8f0 !important; font-weight: 600 !important; }
@@ -404,6 +428,8 @@ hr {
     border-radius: 10px;
 }
 ::-webkit-scrollbar-thumb:hover { background: rgba(99, 102, 241, 0.55); }
+/* Narrower in the sidebar and chat panel; colours come from the rules above */
+[data-testid="stSidebar"] ::-webkit-scrollbar, .pf-chat-history::-webkit-scrollbar { width: 3px; }
 
 /* ── Caption ────────────────────────────────────────────────────────────── */
 .stCaption, [data-testid="stCaptionContainer"] {
@@ -412,18 +438,12 @@ hr {
     line-height: 1.5 !important;
 }
 
-/* ── Global heading font (Space Grotesk everywhere) ─────────────────────── */
+/* ── Global heading font (Space Grotesk everywhere, incl. markdown) ──────── */
 h1, h2, h3, h4, h5, h6 {
     font-family: 'Space Grotesk', 'Inter', sans-serif !important;
     letter-spacing: -0.02em !important;
 }
 
-/* ── Tab labels ─────────────────────────────────────────────────────────── */
-[data-testid="stTabs"] [data-baseweb="tab"] {
-    font-size: 0.9rem !important;
-    letter-spacing: 0.01em !important;
-}
-
 /* ── Metric widget ──────────────────────────────────────────────────────── */
 [data-testid="stMetric"] {
     background: rgba(13, 21, 40, 0.6);
@@ -444,23 +464,6 @@ h1, h2, h3, h4, h5, h6 {
 p, .stMarkdown p { color: #cbd5e1 !important; }
 label                               { color: #94a3b8 !important; }
 
-/* ── Number inputs ──────────────────────────────────────────────────────── */
-input[type="number"],
-[data-testid="stNumberInput"] input {
-    background: rgba(22, 34, 68, 0.95) !important;
-    border: 1.5px solid rgba(99, 102, 241, 0.5) !important;
-    border-radius: 9px !important;
-    color: #f1f5f9 !important;
-    font-family: 'Inter', sans-serif !important;
-    caret-color: #a5b4fc !important;
-}
-input[type="number"]:focus,
-[data-testid="stNumberInput"] input:focus {
-    border-color: rgba(129, 140, 248, 0.85) !important;
-    box-shadow: 0 0 0 3px rgba(99, 102, 241, 0.22) !important;
-    background: rgba(26, 40, 80, 0.98) !important;
-}
-
 /* ── Select boxes ───────────────────────────────────────────────────────── */
 [data-testid="stSelectbox"] [data-baseweb="select"] > div { background: rgba(22, 34, 68, 0.95) !important; color: #f1f5f9 !important; border-color: rgba(99, 102, 241, 0.5) !important; border-width: 1.5px !important; }
 [data-baseweb="popover"] [data-baseweb="menu"]             { background: #0d1528 !important; border: 1px solid rgba(99,102,241,0.2) !important; }
@@ -489,33 +492,82 @@ input[type="number"]:focus,
 }
 
 /* ── Sidebar text ───────────────────────────────────────────────────────── */
-[data-testid="stSidebar"] p     { color: #94a3b8 !important; }
+[data-testid="stSidebar"] p,
 [data-testid="stSidebar"] label { color: #94a3b8 !important; }
 
 /* ── Alert / warning text ───────────────────────────────────────────────── */
 [data-testid="stAlert"] p,
 [data-testid="stAlert"] div { color: #e2e8f0 !important; }
 </style>
-""",
-    unsafe_allow_html=True,
-)
+"""
+
+
+@st.cache_resource(show_spinner=False)
+def _css(version: str = _CSS_VERSION) -> str:
+    """Return the minified global stylesheet — built once per process."""
+    return _minify_css(_CSS)
+
+
+# Minimal stylesheet for the password gate — unauthenticated reruns never
+# pay for the full app theme above.
+_LOGIN_CSS = _minify_css("""
+<style>
+@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&display=swap');
+html { font-size: 16px !important; }
+html, body, .stApp {
+    font-family: 'Inter', sans-serif !important;
+    color: #cbd5e1 !important;
+    -webkit-font-smoothing: antialiased !important;
+}
+.stApp {
+    background: radial-gradient(ellipse at 20% 20%, #0f1729 0%, #080c14 45%, #0a0f1e 100%) !important;
+}
+#MainMenu, footer, header { visibility: hidden; }
+[data-testid="stToolbar"] { display: none; }
+[data-testid="stForm"] { border: none !important; padding: 0 !important; }
+[data-testid="stTextInput"] input {
+    background: rgba(25, 38, 75, 0.98) !important;
+    border: 1.5px solid rgba(129, 140, 248, 0.55) !important;
+    border-radius: 9px !important;
+    color: #f1f5f9 !important;
+    font-family: 'Inter', sans-serif !important;
+    caret-color: #a5b4fc !important;
+}
+[data-testid="stTextInput"] input:focus {
+    border-color: #818cf8 !important;
+    box-shadow: 0 0 0 3px rgba(99, 102, 241, 0.28) !important;
+}
+[data-testid="stFormSubmitButton"] > button {
+    background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%) !important;
+    color: #fff !important;
+    border: none !important;
+    border-radius: 10px !important;
+    font-family: 'Inter', sans-serif !important;
+    font-weight: 600 !important;
+    box-shadow: 0 0 18px rgba(99, 102, 241, 0.35), 0 2px 8px rgba(0,0,0,0.4) !important;
+}
+::placeholder { color: rgba(148, 163, 184, 0.6) !important; font-style: italic !important; }
+.stCaption, [data-testid="stCaptionContainer"] { color: rgba(148, 163, 184, 0.7) !important; }
+[data-testid="stAlert"] {
+    background: rgba(13, 21, 40, 0.7) !important;
+    border-radius: 10px !important;
+}
+[data-testid="stAlert"] p, [data-testid="stAlert"] div { color: #e2e8f0 !important; }
+</style>
+""")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # HTML component helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _html_logo() -> str:
-    return """
+_LOGO_HTML = """
 <div style="padding:0.25rem 0 1.25rem 0; text-align:center;">
   <div style="
     font-size:2rem; margin-bottom:0.2rem; line-height:1;
     filter: drop-shadow(0 0 12px rgba(129,140,248,0.6));
   ">🏔️</div>
-  <div style="
-    background: linear-gradient(135deg, #818cf8 0%, #c084fc 60%, #818cf8 100%);
-    -webkit-background-clip: text; -webkit-text-fill-color: transparent;
-    background-clip: text;
+  <div class="pf-grad pf-grad-logo" style="
     font-size: 1.45rem; font-weight: 900; letter-spacing: -0.03em; line-height:1;
   ">PeakForm</div>
   <div style="color:rgba(100,116,139,0.7); font-size:0.7rem; font-weight:500;
@@ -525,41 +577,34 @@ def _html_logo() -> str:
 </div>
 """
 
-
-def _html_section_label(text: str, icon: str = "") -> str:
-    return f"""
+_SECTION_LABEL_TMPL = """
 <div style="
   display:flex; align-items:center; gap:0.45rem;
   color:rgba(100,116,139,0.8); font-size:0.7rem; font-weight:700;
   text-transform:uppercase; letter-spacing:0.1em;
   margin:1.1rem 0 0.6rem 0;
 ">
-  {f'<span style="font-size:0.85rem">{icon}</span>' if icon else ''}
+  {icon}
   {text}
 </div>
 """
 
-
-def _html_week_banner(week_label: str) -> str:
-    return f"""
+_WEEK_BANNER_TMPL = """
 <div style="
   display:flex; align-items:center; justify-content:space-between;
-  background: linear-gradient(135deg, rgba(99,102,241,0.12) 0%, rgba(139,92,246,0.08) 100%);
+  background: rgba(20,28,48,0.85);
   border: 1px solid rgba(99,102,241,0.2);
   border-radius: 14px;
   padding: 1rem 1.4rem;
   margin-bottom: 1.4rem;
-  backdrop-filter: blur(20px);
+  box-shadow: inset 0 1px 0 rgba(255,255,255,0.04);
 ">
   <div>
     <div style="color:rgba(148,163,184,0.6); font-size:0.72rem; font-weight:600;
       text-transform:uppercase; letter-spacing:0.09em; margin-bottom:0.3rem;">
       Analysis Week
     </div>
-    <div style="
-      background: linear-gradient(135deg, #a5b4fc 0%, #c084fc 100%);
-      -webkit-background-clip:text; -webkit-text-fill-color:transparent;
-      background-clip:text;
+    <div class="pf-grad pf-grad-soft" style="
       font-size:1.5rem; font-weight:800; letter-spacing:-0.02em;
     ">{week_label}</div>
   </div>
@@ -567,31 +612,24 @@ def _html_week_banner(week_label: str) -> str:
 </div>
 """
 
-
-def _html_section_header(title: str, subtitle: str = "") -> str:
-    sub = f'<div style="color:rgba(148,163,184,0.55);font-size:0.8rem;margin-top:0.2rem">{subtitle}</div>' if subtitle else ""
-    return f"""
+_SECTION_HEADER_TMPL = """
 <div style="margin:0.5rem 0 1.1rem 0;">
-  <div style="
-    background:linear-gradient(135deg,#818cf8 0%,#c084fc 100%);
-    -webkit-background-clip:text;-webkit-text-fill-color:transparent;
-    background-clip:text;
+  <div class="pf-grad" style="
     font-size:1.15rem;font-weight:800;letter-spacing:-0.01em;
   ">{title}</div>
   {sub}
 </div>
 """
 
+_SECTION_SUBTITLE_TMPL = '<div style="color:rgba(148,163,184,0.55);font-size:0.8rem;margin-top:0.2rem">{subtitle}</div>'
 
-def _html_feature_card(icon: str, title: str, body: str, glow_color: str = "#6366f1") -> str:
-    return f"""
+_FEATURE_CARD_TMPL = """
 <div style="
-  background: linear-gradient(135deg, rgba(17,24,39,0.95) 0%, rgba(30,41,59,0.5) 100%);
+  background: linear-gradient(135deg, rgba(17,24,39,1) 0%, rgba(30,41,59,0.5) 100%);
   border: 1px solid rgba(99,102,241,0.18);
   border-radius: 16px;
   padding: 1.4rem;
   height:100%;
-  backdrop-filter: blur(20px);
   box-shadow: 0 4px 30px rgba(0,0,0,0.4), inset 0 1px 0 rgba(255,255,255,0.04);
   transition: transform 0.2s ease, box-shadow 0.2s ease;
 ">
@@ -605,48 +643,418 @@ def _html_feature_card(icon: str, title: str, body: str, glow_color: str = "#636
 """
 
 
-def _html_chat_history(messages: list) -> str:
-    if not messages:
-        return """
+def _html_logo() -> str:
+    return _LOGO_HTML
+
+
+def _html_section_label(text: str, icon: str = "") -> str:
+    icon_html = f'<span style="font-size:0.85rem">{icon}</span>' if icon else ""
+    return _SECTION_LABEL_TMPL.format(icon=icon_html, text=text)
+
+
+def _html_week_banner(week_label: str) -> str:
+    return _WEEK_BANNER_TMPL.format(week_label=week_label)
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_week_banner(week_start, week_end) -> str:
+    """Week banner HTML, reused across reruns while the result is unchanged.
+
+    A plain lru_cache: Timestamps hash in O(1), so a hit skips both the
+    strftime calls and st.cache_data's argument hashing."""
+    return _html_week_banner(
+        week_start.strftime("%b %d") + " – " + week_end.strftime("%b %d, %Y")
+    )
+
+
+def _html_section_header(title: str, subtitle: str = "") -> str:
+    sub = _SECTION_SUBTITLE_TMPL.format(subtitle=subtitle) if subtitle else ""
+    return _SECTION_HEADER_TMPL.format(title=title, sub=sub)
+
+
+def _html_feature_card(icon: str, title: str, body: str, glow_color: str = "#6366f1") -> str:
+    return _FEATURE_CARD_TMPL.format(icon=icon, title=title, body=body, glow_color=glow_color)
+
+
+# Section headers are literal — render them once at import.
+_HDR_ADHERENCE = _html_section_header(
+    "Plan Adherence",
+    "How closely did this week match the targets?",
+)
+_HDR_WEIGHT_MILEAGE = _html_section_header(
+    "Weight & Mileage",
+    "Body weight trend toward goal · weekly running distance",
+)
+_HDR_NUTRITION = _html_section_header(
+    "Nutrition",
+    "Daily calorie & protein tracking vs. active targets",
+)
+_HDR_RUN_STRENGTH = _html_section_header(
+    "Running & Strength",
+    "Flat-run pace trend · sets by muscle group this week",
+)
+_HDR_INTERVIEW = _html_section_header(
+    "Performance Interview",
+    "Tell the coach how last week felt — be honest, not optimistic.",
+)
+_HDR_ANALYSIS = _html_section_header(
+    "Performance-First Analysis",
+    "AI synthesis of your Garmin data, nutrition, and biofeedback.",
+)
+_HDR_PROPOSAL = _html_section_header(
+    "Strategy Proposal",
+    "Review and approve the plan — discuss meal preferences with the coach before generating.",
+)
+_HDR_WEEKLY_PLAN = _html_section_header(
+    "Your Weekly Plan",
+    "Macro-verified · ready to execute · discuss changes with the coach to update.",
+)
+
+
+_LANDING_HERO_HTML = """
+<div style="text-align:center;padding:3.5rem 1rem 2.5rem;">
+  <div style="font-size:4rem;margin-bottom:0.5rem;
+    filter:drop-shadow(0 0 30px rgba(129,140,248,0.7))">🏔️</div>
+  <div class="pf-grad pf-grad-hero" style="
+    font-size:3.2rem;font-weight:900;letter-spacing:-0.04em;
+    line-height:1.05;margin-bottom:0.8rem;
+  ">PeakForm</div>
+  <div style="
+    color:rgba(148,163,184,0.65);font-size:1.05rem;
+    font-weight:400;max-width:500px;margin:0 auto 0.8rem;
+    line-height:1.6;
+  ">Weekly fitness &amp; nutrition intelligence, powered by your own data.</div>
+  <div style="
+    display:inline-block;
+    background:rgba(99,102,241,0.12);border:1px solid rgba(99,102,241,0.25);
+    border-radius:20px;padding:0.35rem 1rem;
+    color:#818cf8;font-size:0.78rem;font-weight:600;
+    text-transform:uppercase;letter-spacing:0.08em;
+  ">← Upload data in the sidebar to get started</div>
+</div>
+"""
+
+# Logo + first section label are adjacent and static — emit them as one element.
+_SIDEBAR_HEADER_HTML = _LOGO_HTML + _html_section_label("Data Exports", "📂")
+
+_LANDING_STRIP_HTML = """
+<div style="
+  display:flex;align-items:center;gap:1rem;
+  background:rgba(13,21,40,0.5);
+  border:1px solid rgba(99,102,241,0.12);
+  border-radius:12px;padding:1rem 1.5rem;
+  margin-top:1.8rem;
+">
+  <span style="font-size:1.4rem">💡</span>
+  <div style="color:rgba(148,163,184,0.7);font-size:0.85rem;line-height:1.5;">
+    <strong style="color:#a5b4fc;">How it works:</strong>
+    Export your <strong style="color:#e2e8f0;">MacroFactor XLSX</strong> and
+    <strong style="color:#e2e8f0;">Garmin CSV</strong>, upload them in the sidebar,
+    click <strong style="color:#818cf8;">▶ Run Analysis</strong>, and your full
+    weekly intelligence report will appear — along with interactive charts and
+    an AI coach ready to answer your questions.
+  </div>
+</div>
+"""
+
+_CARD_GRID_TMPL = (
+    # auto-fit wraps the cards onto extra rows on narrow (mobile) screens
+    '<div style="display:grid;'
+    'grid-template-columns:repeat(auto-fit,minmax(min(100%,{min_w}),1fr));'
+    'gap:{gap};">{cards}</div>'
+)
+
+_LANDING_HTML = (
+    _LANDING_HERO_HTML
+    + _CARD_GRID_TMPL.format(
+        min_w="220px",
+        gap="1rem",
+        cards=(
+            _html_feature_card(
+                "📊",
+                "Weekly Report",
+                "Running, strength, nutrition, body composition — all in one intelligent summary with flags and recommendations.",
+                "#6366f1",
+            )
+            + _html_feature_card(
+                "🤖",
+                "AI Coach",
+                "Ask anything about your numbers. The coach has your full data as context and is always available in the sidebar.",
+                "#8b5cf6",
+            )
+            + _html_feature_card(
+                "📈",
+                "Interactive Charts",
+                "Weight trend, weekly mileage, calorie balance, protein adherence, pace trend, strength volume — all live.",
+                "#06b6d4",
+            )
+        ),
+    )
+    + _LANDING_STRIP_HTML
+)
+
+# ── Smart Plan ───────────────────────────────────────────────────────────────
+
+_PHASES = ["Interview", "Analysis", "Proposal", "Weekly Plan"]
+
+_MESO_LENGTHS = (4, 8, 12, 16)
+_MESO_TYPES = ("Base Build", "Strength Block", "Peak", "Taper", "Maintenance")
+_MESO_LEN_IDX = {v: i for i, v in enumerate(_MESO_LENGTHS)}
+_MESO_TYPE_IDX = {v: i for i, v in enumerate(_MESO_TYPES)}
+
+_PHASE_BAR_CONNECTOR = '<div style="flex:1;height:2px;background:rgba(129,140,248,0.15);margin:0 0.3rem;"></div>'
+
+
+def _html_phase_bar(current: int) -> str:
+    items = []
+    for i, label in enumerate(_PHASES, start=1):
+        if i < current:
+            color, weight = "#10b981", "600"
+            dot = "✓"
+        elif i == current:
+            color, weight = "#818cf8", "700"
+            dot = str(i)
+        else:
+            color, weight = "#334155", "400"
+            dot = str(i)
+        items.append(
+            f'<div style="display:flex;align-items:center;gap:0.4rem;">'
+            f'<div style="width:26px;height:26px;border-radius:50%;background:{color};'
+            f'display:flex;align-items:center;justify-content:center;'
+            f'font-size:0.75rem;font-weight:{weight};color:#fff;">{dot}</div>'
+            f'<span style="font-size:0.82rem;font-weight:{weight};color:{color};">{label}</span>'
+            f'</div>'
+        )
+    inner = _PHASE_BAR_CONNECTOR.join(items)
+    return (
+        f'<div style="display:flex;align-items:center;gap:0.2rem;'
+        f'background:rgba(8,12,20,0.7);border:1px solid rgba(99,102,241,0.15);'
+        f'border-radius:12px;padding:0.75rem 1.25rem;margin-bottom:1.5rem;">'
+        f'{inner}</div>'
+    )
+
+
+# Only four states exist — build them all at import.
+_PHASE_BAR_HTML = tuple(_html_phase_bar(i) for i in range(1, len(_PHASES) + 1))
+
+
+_PHASE_CARDS = [
+    ("1", "🎙️", "Performance Interview", "Sleep, RPE, hunger, mesocycle context, and your new MacroFactor targets."),
+    ("2", "🔬", "AI Analysis", "Garmin trends + nutrition + biofeedback synthesised into a performance-first assessment."),
+    ("3", "📋", "Strategy Proposal", "Nutrition pivot, intensity verdict, and day-by-day training schedule for your approval."),
+    ("4", "📥", "Weekly Plan", "Finalised 7-day meal + training template, macro-verified and ready to download."),
+]
+
+_PHASE_CARD_TMPL = """
+<div style="
+  background:linear-gradient(135deg,rgba(17,24,39,0.95),rgba(30,41,59,0.5));
+  border:1px solid rgba(99,102,241,0.18);border-radius:14px;
+  padding:1.2rem;height:100%;text-align:center;
+">
+  <div style="font-size:1.8rem;margin-bottom:0.5rem;">{icon}</div>
+  <div style="font-size:0.7rem;font-weight:700;color:rgba(129,140,248,0.6);
+    text-transform:uppercase;letter-spacing:0.1em;margin-bottom:0.3rem;">Phase {num}</div>
+  <div style="font-size:0.9rem;font-weight:700;color:#e2e8f0;margin-bottom:0.4rem;">{title}</div>
+  <div style="font-size:0.8rem;color:rgba(148,163,184,0.65);line-height:1.5;">{desc}</div>
+</div>
+"""
+
+_SMART_PLAN_INTRO_HTML = (
+    """
+<div style="text-align:center;padding:2rem 1rem 1.5rem;">
+  <div style="font-size:3rem;margin-bottom:0.5rem;
+    filter:drop-shadow(0 0 20px rgba(129,140,248,0.6))">🎯</div>
+  <div class="pf-grad pf-grad-hero" style="
+    font-size:2rem;font-weight:800;letter-spacing:-0.03em;
+    margin-bottom:0.5rem;">Smart Weekly Plan</div>
+  <div style="color:rgba(148,163,184,0.7);font-size:1rem;max-width:520px;
+    margin:0 auto;line-height:1.6;">
+    A 4-phase AI coaching session that synthesises your Garmin performance,
+    MacroFactor nutrition strategy, and subjective biofeedback into a
+    personalised, downloadable weekly plan.
+  </div>
+</div>
+"""
+    + _CARD_GRID_TMPL.format(
+        min_w="160px",
+        gap="0.75rem",
+        cards="".join(
+            _PHASE_CARD_TMPL.format(num=num, icon=icon, title=title, desc=desc)
+            for num, icon, title, desc in _PHASE_CARDS
+        ),
+    )
+    + "<div style='height:1.5rem'></div>"
+)
+
+
+_CHAT_PANEL_HEADER_HTML = """
+<div style="
+  background:linear-gradient(180deg,rgba(12,17,32,0.95) 0%,rgba(13,21,40,0.98) 100%);
+  border:1px solid rgba(99,102,241,0.2);border-radius:16px;
+  padding:1rem 1rem 0.75rem;margin-top:0.1rem;
+">
+  <div style="display:flex;align-items:center;gap:0.5rem;margin-bottom:0.5rem;">
+    <span style="font-size:1.1rem;filter:drop-shadow(0 0 6px rgba(129,140,248,0.6))">🤖</span>
+    <span class="pf-grad" style="font-weight:700;font-size:0.95rem;">AI Coach</span>
+  </div>
+</div>
+"""
+
+_CHAT_PANEL_INACTIVE_HTML = (
+    '<div style="color:rgba(100,116,139,0.6);font-size:0.8rem;'
+    'text-align:center;padding:1.5rem 0.5rem;">'
+    "Run an analysis to<br>activate the AI Coach."
+    "</div>"
+)
+
+_CHAT_HISTORY_LEN = 10  # most recent messages shown in the coach panels
+
+_EMPTY_CHAT_HTML = """
 <div style="text-align:center;padding:1.5rem 0;color:rgba(100,116,139,0.5);font-size:0.8rem;">
   No messages yet.<br>Ask me anything about your data!
 </div>"""
-    items = []
-    for msg in messages[-10:]:  # show last 10
-        role = msg["role"]
-        content = msg["content"]
-        # Escape HTML in content
-        safe = (content
-                .replace("&", "&amp;")
-                .replace("<", "&lt;")
-                .replace(">", "&gt;")
-                .replace("\n", "<br>"))
-        if role == "user":
-            items.append(f"""
+
+_USER_MSG_TMPL = """
 <div class="pf-msg-label pf-msg-label-user">You</div>
-<div class="pf-msg-user">{safe}</div>""")
-        else:
-            items.append(f"""
+<div class="pf-msg-user">{safe}</div>"""
+
+_ASSISTANT_MSG_TMPL = """
 <div class="pf-msg-label pf-msg-label-coach">🏔 Coach</div>
-<div class="pf-msg-assistant">{safe}</div>""")
-    return f'<div class="pf-chat-history">{"".join(items)}</div>'
+<div class="pf-msg-assistant">{safe}</div>"""
+
+
+def _html_chat_message(role: str, content: str) -> str:
+    """One escaped chat bubble."""
+    tmpl = _USER_MSG_TMPL if role == "user" else _ASSISTANT_MSG_TMPL
+    # html.escape + str.replace run as C-level substring scans; translate()
+    # with multi-character replacements goes through a per-character path.
+    return tmpl.format(safe=_esc(content, quote=False).replace("\n", "<br>"))
+
+
+def _html_chat_history(messages: list) -> str:
+    """Render the last _CHAT_HISTORY_LEN messages; the full log is kept and persisted."""
+    if not messages:
+        return _EMPTY_CHAT_HTML
+    items = "".join(
+        _html_chat_message(msg["role"], msg["content"])
+        for msg in messages[-_CHAT_HISTORY_LEN:]
+    )
+    return f'<div class="pf-chat-history">{items}</div>'
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _save_upload(upload, suffix: str) -> str:
-    if "tmp_dir" not in st.session_state:
-        st.session_state.tmp_dir = tempfile.mkdtemp(prefix="peakform_")
-    path = os.path.join(st.session_state.tmp_dir, f"upload{suffix}")
-    with open(path, "wb") as f:
-        f.write(upload.getvalue())
-    return path
+_UPLOAD_CHUNK = 1024 * 1024
+
+
+@st.cache_resource(show_spinner=False)
+def _tmp_root() -> str:
+    """Process-wide upload scratch dir, removed when the server exits."""
+    d = tempfile.mkdtemp(prefix="peakform_")
+    atexit.register(shutil.rmtree, d, ignore_errors=True)
+    return d
+
+
+def _save_upload(upload, suffix: str) -> tuple[str, str]:
+    """Store an upload under its content hash; return ``(path, hex digest)``.
+
+    Paths are content-addressed and shared by every session, so re-running
+    with a byte-identical export skips the disk write entirely.  Files are
+    never rewritten in place, which also keeps cached results (whose
+    read-only workbook still points at the file) valid.
+    """
+    # Repeat runs with the same uploader widget value (e.g. only the week
+    # changed) reuse the earlier result without reading the bytes again.
+    file_id = getattr(upload, "file_id", None)
+    memo_key = f"_saved_upload_{file_id}"
+    saved = st.session_state.get(memo_key) if file_id else None
+    if saved is not None and os.path.exists(saved[0]):
+        return saved
+
+    # Stream in chunks rather than getvalue() — readinto() reuses one buffer
+    # instead of allocating a bytes object per chunk.
+    buf = bytearray(_UPLOAD_CHUNK)
+    mv = memoryview(buf)
+    digest = hashlib.blake2b(digest_size=16)
+    upload.seek(0)
+    while (n := upload.readinto(buf)) > 0:
+        digest.update(mv[:n])
+    key = digest.hexdigest()
+    path = os.path.join(_tmp_root(), f"{key}{suffix}")
+
+    if not os.path.exists(path):
+        upload.seek(0)
+        # Write beside the target and rename, so a concurrent session never
+        # sees a half-written file at the final path.
+        fd, tmp = tempfile.mkstemp(dir=_tmp_root(), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while (n := upload.readinto(buf)) > 0:
+                    f.write(mv[:n])
+            os.replace(tmp, path)
+        except BaseException:
+            # The upload dir is shared by every session; don't strand partials
+            os.unlink(tmp)
+            raise
+
+    if file_id:
+        st.session_state[memo_key] = (path, key)
+    return path, key
+
+
+@functools.lru_cache(maxsize=4)
+def _utf8(text: str) -> bytes:
+    """Download payloads, encoded once per distinct report/plan.
+
+    str hashes are cached on the object and lookups hit on identity, so a
+    repeat call for the same string costs O(1) instead of a full re-encode.
+    """
+    return text.encode("utf-8")
+
+
+@st.cache_resource(show_spinner=False)
+def _agent_cls():
+    """Import PeakFormAgent (and the anthropic SDK) once per process."""
+    from peakform.chat import PeakFormAgent
+    return PeakFormAgent
+
+
+@st.cache_resource(show_spinner=False)
+def _run_full_fn():
+    """Import the analysis entry point (pandas, parsers, analyzers) once per process."""
+    from peakform.agent import run_full
+    return run_full
+
 
+@st.cache_resource(show_spinner=False)
+def _recs_mod():
+    """Import the Smart Plan prompt builders once per process."""
+    from peakform import recommendations
+    return recommendations
 
+
+@st.cache_resource(ttl=24 * 60 * 60, max_entries=8, show_spinner=False)
+def _cached_run(mf_hash: str, garmin_hash: str, week: str, _mf_path: str, _garmin_path: str):
+    """run_full() memoised on upload content hashes + week.
+
+    cache_resource rather than cache_data: RunResult holds an open openpyxl
+    workbook and cannot be pickled.  Paths are underscore-prefixed so they
+    are not part of the key.
+
+    The returned RunResult is one object shared by every session that
+    uploads the same files: treat it (and its DataFrames) as read-only and
+    copy before modifying.  Lazy MacroFactor sheet parsing is the only
+    mutation and is serialised by macrofactor._PARSE_LOCK.
+    """
+    return _run_full_fn()(_mf_path, _garmin_path, week=week, verbose=False)
+
+
+@st.cache_resource(show_spinner=False)
 def _api_key() -> str:
-    # Read from environment (set via Cloud Run env var / GitHub Secret)
+    # Read from environment (set via Cloud Run env var / GitHub Secret).
+    # Resolved once per process — env and secrets don't change at runtime.
     key = os.environ.get("ANTHROPIC_API_KEY", "")
     if key:
         return key
@@ -656,22 +1064,89 @@ def _api_key() -> str:
         return ""
 
 
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _build_agent(result_key: str, api_key: str, _result):
+    """Build the system prompt + Anthropic client once per analysis result.
+
+    ``_result`` is left unhashed (leading underscore) — ``result_key`` is the
+    cache key.  Callers must ``fork()`` the returned agent before chatting so
+    sessions never share conversation history.
+    """
+    return _agent_cls()(
+        report_md=_result.report_md,
+        mf_data=_result.mf_data,
+        garmin_data=_result.garmin_data,
+        week_start=_result.week_start,
+        week_end=_result.week_end,
+        client=_recs_mod().client(api_key),
+    )
+
+
+def _result_key(result) -> str:
+    """Cheap cache key for ``_build_agent`` — the week span plus a hash of
+    the report text.  The parsed DataFrames never enter Streamlit's hasher."""
+    return f"{result.week_start}:{result.week_end}:{hash(result.report_md)}"
+
+
+_PLOTLY_CONFIG = {"displayModeBar": False}
+# Summary figures have nothing to zoom or hover — render them static.
+_PLOTLY_CONFIG_STATIC = {"displayModeBar": False, "staticPlot": True}
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _build_charts(result_key: str, _result) -> dict:
+    """Charts-tab figures, built once per analysis result.
+
+    Each value is a Plotly figure, or the exception its builder raised so the
+    tab can still show a per-chart warning.
+    """
+    from peakform import charts as _c
+
+    mf, gd = _result.mf_data, _result.garmin_data
+    w_start, w_end = _result.week_start, _result.week_end
+    builders = {
+        "adherence": lambda: _c.adherence_scorecard(mf, gd, w_start, w_end)[0],
+        "weight": lambda: _c.weight_trend_chart(mf),
+        "mileage": lambda: _c.weekly_mileage_chart(gd),
+        "calories": lambda: _c.calories_vs_target_chart(mf),
+        "protein": lambda: _c.protein_adherence_chart(mf),
+        "deficit": lambda: _c.weekly_deficit_chart(mf),
+        "pace": lambda: _c.pace_trend_chart(gd),
+        "muscle": lambda: _c.muscle_group_chart(mf, w_start, w_end),
+    }
+    def _safe(build):
+        try:
+            return build()
+        except Exception as e:
+            return e
+
+    # Figures are independent — build them side by side on first render.
+    with ThreadPoolExecutor(max_workers=len(builders)) as ex:
+        futures = {name: ex.submit(_safe, build) for name, build in builders.items()}
+    return {name: f.result() for name, f in futures.items()}
+
+
+def _show_chart(fig, label: str, static: bool = False) -> None:
+    if isinstance(fig, Exception):
+        st.warning(f"{label} unavailable: {fig}")
+    else:
+        config = _PLOTLY_CONFIG_STATIC if static else _PLOTLY_CONFIG
+        st.plotly_chart(fig, use_container_width=True, config=config)
+
+
 def _init_agent(result) -> None:
     """(Re-)initialise the PeakFormAgent if an API key is available."""
     key = _api_key()
     if key:
+        # A failed build isn't cached by cache_resource — remember the inputs
+        # so the per-rerun "no agent yet" check doesn't retry it every time.
+        fp = (_result_key(result), key)
+        if st.session_state.get("_agent_failed_fp") == fp:
+            return
         try:
-            from peakform.chat import PeakFormAgent
-            st.session_state.agent = PeakFormAgent(
-                report_md=result.report_md,
-                mf_data=result.mf_data,
-                garmin_data=result.garmin_data,
-                week_start=result.week_start,
-                week_end=result.week_end,
-                api_key=key,
-            )
+            st.session_state.agent = _build_agent(fp[0], key, result).fork()
         except Exception:
-            pass
+            st.session_state["_agent_failed_fp"] = fp
     elif "agent" in st.session_state:
         del st.session_state["agent"]
 
@@ -686,7 +1161,7 @@ def _try_restore_state() -> None:
         if saved is None:
             return
         st.session_state.result = saved["result"]
-        st.session_state.messages = saved["messages"]
+        st.session_state.messages = list(saved["messages"])
         # Reconstruct InterviewState from the saved dict, ignoring unknown keys
         from peakform.recommendations import InterviewState
         rec_dict = saved["rec"]
@@ -724,10 +1199,27 @@ def _persist_save_messages() -> None:
 # Password gate
 # ─────────────────────────────────────────────────────────────────────────────
 
+@st.cache_resource(show_spinner=False)
+def _expected_password_digest() -> bytes:
+    """SHA-256 of APP_PASSWORD, resolved once per process (b"" if unset).
+
+    Comparing fixed-length digests with hmac.compare_digest keeps the check
+    constant-time and leaks nothing about the password's length.
+    """
+    expected = os.environ.get("APP_PASSWORD") or ""
+    try:
+        expected = expected or st.secrets.get("APP_PASSWORD", "")
+    except Exception:
+        pass
+    return hashlib.sha256(expected.encode("utf-8")).digest() if expected else b""
+
+
 def _check_password() -> None:
     if st.session_state.get("authenticated"):
         return
 
+    st.html(_LOGIN_CSS)
+
     # Centered login card
     st.markdown(
         """
@@ -765,15 +1257,16 @@ def _check_password() -> None:
     # Actual inputs (can't put inside HTML div)
     _, col, _ = st.columns([1, 2, 1])
     with col:
-        pw = st.text_input("Password", type="password", key="_pw", label_visibility="collapsed",
-                           placeholder="Enter password…")
-        if st.button("Sign In", type="primary", use_container_width=True):
-            expected = os.environ.get("APP_PASSWORD") or ""
-            try:
-                expected = expected or st.secrets.get("APP_PASSWORD", "")
-            except Exception:
-                pass
-            if pw and pw == expected:
+        # A form so typing in the box doesn't trigger a rerun — only Sign In does
+        with st.form("pw_form", clear_on_submit=True):
+            pw = st.text_input("Password", type="password", key="_pw", label_visibility="collapsed",
+                               placeholder="Enter password…")
+            submitted = st.form_submit_button("Sign In", type="primary", use_container_width=True)
+        if submitted:
+            expected = _expected_password_digest()
+            if pw and expected and hmac.compare_digest(
+                hashlib.sha256(pw.encode("utf-8")).digest(), expected
+            ):
                 st.session_state.authenticated = True
                 st.rerun()
             else:
@@ -784,6 +1277,13 @@ def _check_password() -> None:
 
 
 _check_password()
+
+# Injected on every run on purpose: Streamlit drops any element a rerun does
+# not re-emit, so a "first run only" guard would unstyle the app.  st.html
+# skips the markdown pipeline (and, unlike components.html, is not iframed,
+# so the rules reach the page).
+st.html(_css(_CSS_VERSION))
+
 _try_restore_state()
 
 
@@ -793,11 +1293,10 @@ _try_restore_state()
 
 with st.sidebar:
 
-    # ── Logo ────────────────────────────────────────────────────────────────
-    st.markdown(_html_logo(), unsafe_allow_html=True)
+    # ── Logo + data upload label ─────────────────────────────────────────────
+    st.markdown(_SIDEBAR_HEADER_HTML, unsafe_allow_html=True)
 
     # ── Data upload ──────────────────────────────────────────────────────────
-    st.markdown(_html_section_label("Data Exports", "📂"), unsafe_allow_html=True)
 
     with st.expander("Upload files", expanded=not bool(st.session_state.get("result"))):
         mf_upload = st.file_uploader(
@@ -824,12 +1323,16 @@ with st.sidebar:
         )
         st.caption("Week to analyse  ·  leave blank for this week")
 
-    can_run = bool(mf_upload and garmin_upload)
+    # The button must be emitted every run (a skipped widget is removed and
+    # its click lost); a stable key keeps its identity fixed so the frontend
+    # only patches the `disabled` prop when upload state flips.
+    can_run = mf_upload is not None and garmin_upload is not None
     run_btn = st.button(
         "▶  Run Analysis",
         type="primary",
         disabled=not can_run,
         use_container_width=True,
+        key="run_analysis_btn",
     )
 
     # ── Persistence status ───────────────────────────────────────────────────
@@ -882,19 +1385,20 @@ with st.sidebar:
 # ─────────────────────────────────────────────────────────────────────────────
 
 if run_btn and can_run:
-    mf_path = _save_upload(mf_upload, ".xlsx")
-    garmin_path = _save_upload(garmin_upload, ".csv")
+    mf_path, mf_hash = _save_upload(mf_upload, ".xlsx")
+    garmin_path, garmin_hash = _save_upload(garmin_upload, ".csv")
 
     with st.spinner("Analysing your data…"):
         try:
-            from peakform.agent import run_full
             from peakform.recommendations import InterviewState
 
-            result = run_full(
+            # Blank week → today, so the cache key rolls over with the calendar
+            result = _cached_run(
+                mf_hash,
+                garmin_hash,
+                week_input.strip() or _date.today().isoformat(),
                 mf_path,
                 garmin_path,
-                week=week_input.strip() or None,
-                verbose=False,
             )
             st.session_state.result = result
             st.session_state.messages = []
@@ -919,92 +1423,8 @@ if run_btn and can_run:
 
 if "result" not in st.session_state:
 
-    # Hero
-    st.markdown(
-        """
-<div style="text-align:center;padding:3.5rem 1rem 2.5rem;">
-  <div style="font-size:4rem;margin-bottom:0.5rem;
-    filter:drop-shadow(0 0 30px rgba(129,140,248,0.7))">🏔️</div>
-  <div style="
-    background:linear-gradient(135deg,#a5b4fc 0%,#c084fc 50%,#818cf8 100%);
-    -webkit-background-clip:text;-webkit-text-fill-color:transparent;
-    background-clip:text;
-    font-size:3.2rem;font-weight:900;letter-spacing:-0.04em;
-    line-height:1.05;margin-bottom:0.8rem;
-  ">PeakForm</div>
-  <div style="
-    color:rgba(148,163,184,0.65);font-size:1.05rem;
-    font-weight:400;max-width:500px;margin:0 auto 0.8rem;
-    line-height:1.6;
-  ">Weekly fitness &amp; nutrition intelligence, powered by your own data.</div>
-  <div style="
-    display:inline-block;
-    background:rgba(99,102,241,0.12);border:1px solid rgba(99,102,241,0.25);
-    border-radius:20px;padding:0.35rem 1rem;
-    color:#818cf8;font-size:0.78rem;font-weight:600;
-    text-transform:uppercase;letter-spacing:0.08em;
-  ">← Upload data in the sidebar to get started</div>
-</div>
-""",
-        unsafe_allow_html=True,
-    )
-
-    # Feature cards
-    c1, c2, c3 = st.columns(3, gap="medium")
-    with c1:
-        st.markdown(
-            _html_feature_card(
-                "📊",
-                "Weekly Report",
-                "Running, strength, nutrition, body composition — all in one intelligent summary with flags and recommendations.",
-                "#6366f1",
-            ),
-            unsafe_allow_html=True,
-        )
-    with c2:
-        st.markdown(
-            _html_feature_card(
-                "🤖",
-                "AI Coach",
-                "Ask anything about your numbers. The coach has your full data as context and is always available in the sidebar.",
-                "#8b5cf6",
-            ),
-            unsafe_allow_html=True,
-        )
-    with c3:
-        st.markdown(
-            _html_feature_card(
-                "📈",
-                "Interactive Charts",
-                "Weight trend, weekly mileage, calorie balance, protein adherence, pace trend, strength volume — all live.",
-                "#06b6d4",
-            ),
-            unsafe_allow_html=True,
-        )
-
-    # Instruction strip
-    st.markdown(
-        """
-<div style="
-  display:flex;align-items:center;gap:1rem;
-  background:rgba(13,21,40,0.5);
-  border:1px solid rgba(99,102,241,0.12);
-  border-radius:12px;padding:1rem 1.5rem;
-  margin-top:1.8rem;
-">
-  <span style="font-size:1.4rem">💡</span>
-  <div style="color:rgba(148,163,184,0.7);font-size:0.85rem;line-height:1.5;">
-    <strong style="color:#a5b4fc;">How it works:</strong>
-    Export your <strong style="color:#e2e8f0;">MacroFactor XLSX</strong> and
-    <strong style="color:#e2e8f0;">Garmin CSV</strong>, upload them in the sidebar,
-    click <strong style="color:#818cf8;">▶ Run Analysis</strong>, and your full
-    weekly intelligence report will appear — along with interactive charts and
-    an AI coach ready to answer your questions.
-  </div>
-</div>
-""",
-        unsafe_allow_html=True,
-    )
+    # Hero, feature cards and instruction strip — one static element
+    st.html(_LANDING_HTML)
 
     st.stop()
 
@@ -1018,13 +1438,7 @@ result = st.session_state.result
 if "agent" not in st.session_state and _api_key():
     _init_agent(result)
 
-week_label = (
-    result.week_start.strftime("%b %d")
-    + " – "
-    + result.week_end.strftime("%b %d, %Y")
-)
-
-st.markdown(_html_week_banner(week_label), unsafe_allow_html=True)
+st.markdown(_cached_week_banner(result.week_start, result.week_end), unsafe_allow_html=True)
 
 tab_report, tab_charts, tab_smart = st.tabs(
     ["📊  Weekly Report", "📈  Charts", "🎯  Smart Plan"]
@@ -1032,40 +1446,17 @@ tab_report, tab_charts, tab_smart = st.tabs(
 
 
 # ── Reusable chat panel (used in Report + Charts tabs) ───────────────────────
+# Chat panels are fragments: typing and submitting reruns only the panel.
+# The same conversation is drawn in both tabs, so once a turn is recorded
+# (or the chat cleared) the whole app reruns to keep the two copies in step.
+@st.fragment
 def _render_chat_panel(key: str = "report") -> None:
-    st.markdown(
-        """
-<div style="
-  background:linear-gradient(180deg,rgba(12,17,32,0.95) 0%,rgba(13,21,40,0.98) 100%);
-  border:1px solid rgba(99,102,241,0.2);border-radius:16px;
-  padding:1rem 1rem 0.75rem;margin-top:0.1rem;
-">
-  <div style="display:flex;align-items:center;gap:0.5rem;margin-bottom:0.5rem;">
-    <span style="font-size:1.1rem;filter:drop-shadow(0 0 6px rgba(129,140,248,0.6))">🤖</span>
-    <span style="
-      background:linear-gradient(135deg,#818cf8,#c084fc);
-      -webkit-background-clip:text;-webkit-text-fill-color:transparent;
-      background-clip:text;font-weight:700;font-size:0.95rem;
-    ">AI Coach</span>
-  </div>
-</div>
-""",
-        unsafe_allow_html=True,
-    )
+    # Header + placeholder/history go out as a single markdown element
     if "agent" not in st.session_state:
-        st.markdown(
-            '<div style="color:rgba(100,116,139,0.6);font-size:0.8rem;'
-            'text-align:center;padding:1.5rem 0.5rem;">'
-            "Run an analysis to<br>activate the AI Coach."
-            "</div>",
-            unsafe_allow_html=True,
-        )
+        st.markdown(_CHAT_PANEL_HEADER_HTML + _CHAT_PANEL_INACTIVE_HTML, unsafe_allow_html=True)
         return
 
-    st.markdown(
-        _html_chat_history(st.session_state.get("messages", [])),
-        unsafe_allow_html=True,
-    )
+    history = st.empty()
     with st.form(f"chat_form_{key}", clear_on_submit=True):
         user_input = st.text_input(
             "message",
@@ -1077,25 +1468,36 @@ def _render_chat_panel(key: str = "report") -> None:
     if send and user_input.strip():
         msgs = st.session_state.setdefault("messages", [])
         msgs.append({"role": "user", "content": user_input.strip()})
-        with st.spinner(""):
+        # Stream the reply under the history so far; the final history
+        # render below replaces the whole slot.
+        with history.container():
+            st.markdown(
+                _CHAT_PANEL_HEADER_HTML + _html_chat_history(msgs),
+                unsafe_allow_html=True,
+            )
             try:
-                reply = st.session_state.agent.chat(user_input.strip())
+                reply = st.write_stream(st.session_state.agent.chat_stream(user_input.strip()))
             except Exception as exc:
                 reply = f"⚠️ Error: {exc}"
         msgs.append({"role": "assistant", "content": reply})
         _persist_save_messages()
-        st.rerun()
+        st.rerun(scope="app")  # redraw the other tab's copy of the panel
 
     if st.session_state.get("messages"):
-        if st.button("Clear chat", use_container_width=True):
+        if st.button("Clear chat", key=f"clr_{key}", use_container_width=True):
             st.session_state.messages = []
             st.session_state.agent.reset()
-            st.rerun()
+            st.rerun(scope="app")
+
+    history.markdown(
+        _CHAT_PANEL_HEADER_HTML + _html_chat_history(st.session_state.get("messages", [])),
+        unsafe_allow_html=True,
+    )
 
 
+@st.fragment
 def _render_smart_plan_chat(phase: int) -> None:
     """Render the in-phase coaching chat panel for Smart Plan phases 2–4."""
-    from peakform.recommendations import run_phase_chat
 
     rec = st.session_state.rec
     phase_attr = f"phase{phase}_messages"
@@ -1110,20 +1512,14 @@ def _render_smart_plan_chat(phase: int) -> None:
   border:1px solid rgba(99,102,241,0.2);border-radius:10px;
 ">
   <span style="font-size:1rem;filter:drop-shadow(0 0 5px rgba(129,140,248,0.5))">💬</span>
-  <span style="
-    background:linear-gradient(135deg,#818cf8,#c084fc);
-    -webkit-background-clip:text;-webkit-text-fill-color:transparent;
-    background-clip:text;font-weight:700;font-size:0.9rem;
-  ">Discuss with Coach</span>
+  <span class="pf-grad" style="font-weight:700;font-size:0.9rem;">Discuss with Coach</span>
 </div>
 """,
         unsafe_allow_html=True,
     )
 
-    msgs: list = getattr(rec, phase_attr, [])
-
-    # Chat history
-    st.markdown(_html_chat_history(msgs), unsafe_allow_html=True)
+    # Chat history (filled in below, once any new turn is recorded)
+    history = st.empty()
 
     # Input form
     with st.form(f"sp_chat_{phase}", clear_on_submit=True):
@@ -1140,7 +1536,7 @@ def _render_smart_plan_chat(phase: int) -> None:
         else:
             with st.spinner(""):
                 try:
-                    reply = run_phase_chat(phase, rec, user_input.strip(), _api_key())
+                    reply = _recs_mod().run_phase_chat(phase, rec, user_input.strip(), _api_key())
                 except Exception as exc:
                     reply = f"⚠️ Error: {exc}"
             msgs = getattr(rec, phase_attr, [])
@@ -1148,12 +1544,21 @@ def _render_smart_plan_chat(phase: int) -> None:
             msgs.append({"role": "assistant", "content": reply})
             setattr(rec, phase_attr, msgs)
             _persist_save_rec()   # mid-session update persisted immediately
-            st.rerun()
+            if phase == 4 and len(msgs) == 2:
+                st.rerun()  # reveal "Update Plan", which sits outside this fragment
 
     if getattr(rec, phase_attr, []):
-        if st.button("Clear", key=f"clr_sp{phase}", use_container_width=True):
+        clear = st.empty()
+        if clear.button("Clear", key=f"clr_sp{phase}", use_container_width=True):
             setattr(rec, phase_attr, [])
-            st.rerun()
+            if phase == 4:
+                st.rerun()  # hide "Update Plan" again
+            clear.empty()
+
+    history.markdown(
+        _html_chat_history(getattr(rec, phase_attr, [])),
+        unsafe_allow_html=True,
+    )
 
 
 # ── Report tab ────────────────────────────────────────────────────────────────
@@ -1164,7 +1569,7 @@ with tab_report:
         st.markdown("<div style='height:1rem'></div>", unsafe_allow_html=True)
         st.download_button(
             label="⬇️  Download report (.md)",
-            data=result.report_md,
+            data=_utf8(result.report_md),
             file_name=f"peakform_report_{result.week_start.strftime('%Y-%m-%d')}.md",
             mime="text/markdown",
         )
@@ -1174,93 +1579,41 @@ with tab_report:
 
 # ── Charts tab ────────────────────────────────────────────────────────────────
 with tab_charts:
-    from peakform.charts import (
-        adherence_scorecard,
-        calories_vs_target_chart,
-        muscle_group_chart,
-        pace_trend_chart,
-        protein_adherence_chart,
-        weekly_deficit_chart,
-        weekly_mileage_chart,
-        weight_trend_chart,
-    )
-
-    mf = result.mf_data
-    gd = result.garmin_data
-    w_start = result.week_start
-    w_end = result.week_end
-    _PC = dict(use_container_width=True, config={"displayModeBar": False})
+    figs = _build_charts(_result_key(result), result)
 
     col_ch, col_cc = st.columns([2, 1], gap="large")
     with col_ch:
-        st.markdown(
-            _html_section_header("Plan Adherence", "How closely did this week match the targets?"),
-            unsafe_allow_html=True,
-        )
-        try:
-            adh_fig, _ = adherence_scorecard(mf, gd, w_start, w_end)
-            st.plotly_chart(adh_fig, **_PC)
-        except Exception as e:
-            st.warning(f"Adherence scorecard unavailable: {e}")
+        st.markdown(_HDR_ADHERENCE, unsafe_allow_html=True)
+        _show_chart(figs["adherence"], "Adherence scorecard", static=True)
 
         st.divider()
 
-        st.markdown(
-            _html_section_header("Weight & Mileage", "Body weight trend toward goal · weekly running distance"),
-            unsafe_allow_html=True,
-        )
+        st.markdown(_HDR_WEIGHT_MILEAGE, unsafe_allow_html=True)
         col_w, col_m = st.columns(2, gap="medium")
         with col_w:
-            try:
-                st.plotly_chart(weight_trend_chart(mf), **_PC)
-            except Exception as e:
-                st.warning(f"Weight chart unavailable: {e}")
+            _show_chart(figs["weight"], "Weight chart")
         with col_m:
-            try:
-                st.plotly_chart(weekly_mileage_chart(gd), **_PC)
-            except Exception as e:
-                st.warning(f"Mileage chart unavailable: {e}")
+            _show_chart(figs["mileage"], "Mileage chart")
 
         st.divider()
 
-        st.markdown(
-            _html_section_header("Nutrition", "Daily calorie & protein tracking vs. active targets"),
-            unsafe_allow_html=True,
-        )
+        st.markdown(_HDR_NUTRITION, unsafe_allow_html=True)
         col_cal, col_prot = st.columns(2, gap="medium")
         with col_cal:
-            try:
-                st.plotly_chart(calories_vs_target_chart(mf), **_PC)
-            except Exception as e:
-                st.warning(f"Calories chart unavailable: {e}")
+            _show_chart(figs["calories"], "Calories chart")
         with col_prot:
-            try:
-                st.plotly_chart(protein_adherence_chart(mf), **_PC)
-            except Exception as e:
-                st.warning(f"Protein chart unavailable: {e}")
+            _show_chart(figs["protein"], "Protein chart")
 
-        try:
-            st.plotly_chart(weekly_deficit_chart(mf), **_PC)
-        except Exception as e:
-            st.warning(f"Deficit chart unavailable: {e}")
+        _show_chart(figs["deficit"], "Deficit chart")
 
         st.divider()
 
-        st.markdown(
-            _html_section_header("Running & Strength", "Flat-run pace trend · sets by muscle group this week"),
-            unsafe_allow_html=True,
-        )
+        st.markdown(_HDR_RUN_STRENGTH, unsafe_allow_html=True)
         col_pace, col_mg = st.columns(2, gap="medium")
         with col_pace:
-            try:
-                st.plotly_chart(pace_trend_chart(gd), **_PC)
-            except Exception as e:
-                st.warning(f"Pace chart unavailable: {e}")
+            _show_chart(figs["pace"], "Pace chart")
         with col_mg:
-            try:
-                st.plotly_chart(muscle_group_chart(mf, w_start, w_end), **_PC)
-            except Exception as e:
-                st.warning(f"Muscle group chart unavailable: {e}")
+            _show_chart(figs["muscle"], "Muscle group chart")
 
     with col_cc:
         _render_chat_panel(key="charts")
@@ -1268,112 +1621,27 @@ with tab_charts:
 
 # ── Smart Plan tab ────────────────────────────────────────────────────────────
 with tab_smart:
-    from peakform.recommendations import InterviewState, run_analysis, run_proposal, run_template
-
-    # ── Phase progress indicator ─────────────────────────────────────────────
-    _PHASES = ["Interview", "Analysis", "Proposal", "Weekly Plan"]
-
-    def _phase_bar(current: int) -> str:
-        items = []
-        for i, label in enumerate(_PHASES, start=1):
-            if i < current:
-                color, weight = "#10b981", "600"
-                dot = "✓"
-            elif i == current:
-                color, weight = "#818cf8", "700"
-                dot = str(i)
-            else:
-                color, weight = "#334155", "400"
-                dot = str(i)
-            items.append(
-                f'<div style="display:flex;align-items:center;gap:0.4rem;">'
-                f'<div style="width:26px;height:26px;border-radius:50%;background:{color};'
-                f'display:flex;align-items:center;justify-content:center;'
-                f'font-size:0.75rem;font-weight:{weight};color:#fff;">{dot}</div>'
-                f'<span style="font-size:0.82rem;font-weight:{weight};color:{color};">{label}</span>'
-                f'</div>'
-            )
-        connectors = f'<div style="flex:1;height:2px;background:rgba(129,140,248,0.15);margin:0 0.3rem;"></div>'
-        inner = connectors.join(items)
-        return (
-            f'<div style="display:flex;align-items:center;gap:0.2rem;'
-            f'background:rgba(8,12,20,0.7);border:1px solid rgba(99,102,241,0.15);'
-            f'border-radius:12px;padding:0.75rem 1.25rem;margin-bottom:1.5rem;">'
-            f'{inner}</div>'
-        )
+    _recs = _recs_mod()
 
     # ── State bootstrap ──────────────────────────────────────────────────────
     if "rec" not in st.session_state:
-        st.session_state.rec = InterviewState(phase=0)
+        st.session_state.rec = _recs.InterviewState(phase=0)
 
-    rec: InterviewState = st.session_state.rec
+    rec: _recs.InterviewState = st.session_state.rec
 
     # ── Phase 0 — Landing ────────────────────────────────────────────────────
     if rec.phase == 0:
-        st.markdown(
-            """
-<div style="text-align:center;padding:2rem 1rem 1.5rem;">
-  <div style="font-size:3rem;margin-bottom:0.5rem;
-    filter:drop-shadow(0 0 20px rgba(129,140,248,0.6))">🎯</div>
-  <div style="
-    background:linear-gradient(135deg,#a5b4fc 0%,#c084fc 50%,#818cf8 100%);
-    -webkit-background-clip:text;-webkit-text-fill-color:transparent;
-    background-clip:text;font-size:2rem;font-weight:800;letter-spacing:-0.03em;
-    margin-bottom:0.5rem;">Smart Weekly Plan</div>
-  <div style="color:rgba(148,163,184,0.7);font-size:1rem;max-width:520px;
-    margin:0 auto;line-height:1.6;">
-    A 4-phase AI coaching session that synthesises your Garmin performance,
-    MacroFactor nutrition strategy, and subjective biofeedback into a
-    personalised, downloadable weekly plan.
-  </div>
-</div>
-""",
-            unsafe_allow_html=True,
-        )
-
-        c1, c2, c3, c4 = st.columns(4, gap="small")
-        _phase_cards = [
-            ("1", "🎙️", "Performance Interview", "Sleep, RPE, hunger, mesocycle context, and your new MacroFactor targets."),
-            ("2", "🔬", "AI Analysis", "Garmin trends + nutrition + biofeedback synthesised into a performance-first assessment."),
-            ("3", "📋", "Strategy Proposal", "Nutrition pivot, intensity verdict, and day-by-day training schedule for your approval."),
-            ("4", "📥", "Weekly Plan", "Finalised 7-day meal + training template, macro-verified and ready to download."),
-        ]
-        for col, (num, icon, title, desc) in zip([c1, c2, c3, c4], _phase_cards):
-            with col:
-                st.markdown(
-                    f"""
-<div style="
-  background:linear-gradient(135deg,rgba(17,24,39,0.95),rgba(30,41,59,0.5));
-  border:1px solid rgba(99,102,241,0.18);border-radius:14px;
-  padding:1.2rem;height:100%;text-align:center;
-">
-  <div style="font-size:1.8rem;margin-bottom:0.5rem;">{icon}</div>
-  <div style="font-size:0.7rem;font-weight:700;color:rgba(129,140,248,0.6);
-    text-transform:uppercase;letter-spacing:0.1em;margin-bottom:0.3rem;">Phase {num}</div>
-  <div style="font-size:0.9rem;font-weight:700;color:#e2e8f0;margin-bottom:0.4rem;">{title}</div>
-  <div style="font-size:0.8rem;color:rgba(148,163,184,0.65);line-height:1.5;">{desc}</div>
-</div>
-""",
-                    unsafe_allow_html=True,
-                )
-
-        st.markdown("<div style='height:1.5rem'></div>", unsafe_allow_html=True)
+        st.html(_SMART_PLAN_INTRO_HTML)
         _, mid, _ = st.columns([1, 2, 1])
         with mid:
             if st.button("▶  Start Performance Interview", type="primary", use_container_width=True):
-                st.session_state.rec = InterviewState(phase=1)
+                st.session_state.rec = _recs.InterviewState(phase=1)
                 st.rerun()
 
     # ── Phase 1 — Interview form ─────────────────────────────────────────────
     elif rec.phase == 1:
-        st.markdown(_phase_bar(1), unsafe_allow_html=True)
-        st.markdown(
-            _html_section_header(
-                "Performance Interview",
-                "Tell the coach how last week felt — be honest, not optimistic.",
-            ),
-            unsafe_allow_html=True,
-        )
+        st.markdown(_PHASE_BAR_HTML[0], unsafe_allow_html=True)
+        st.markdown(_HDR_INTERVIEW, unsafe_allow_html=True)
 
         with st.form("interview_form"):
             # ── Biofeedback ──────────────────────────────────────────────────
@@ -1404,15 +1672,13 @@ with tab_smart:
             with col_mw:
                 meso_week = st.number_input("Mesocycle week #", 1, 20, rec.mesocycle_week)
             with col_ml:
-                meso_len = st.selectbox("Cycle length", [4, 8, 12, 16],
-                                        index=[4, 8, 12, 16].index(rec.mesocycle_length))
+                meso_len = st.selectbox("Cycle length", _MESO_LENGTHS,
+                                        index=_MESO_LEN_IDX[rec.mesocycle_length])
             with col_mt:
                 meso_type = st.selectbox(
                     "Cycle type",
-                    ["Base Build", "Strength Block", "Peak", "Taper", "Maintenance"],
-                    index=["Base Build", "Strength Block", "Peak", "Taper", "Maintenance"].index(
-                        rec.mesocycle_type
-                    ),
+                    _MESO_TYPES,
+                    index=_MESO_TYPE_IDX[rec.mesocycle_type],
                 )
 
             st.divider()
@@ -1472,7 +1738,7 @@ with tab_smart:
                     _err = None
                     with st.spinner("Synthesising Garmin + MacroFactor + biofeedback…"):
                         try:
-                            rec.analysis_text = run_analysis(
+                            rec.analysis_text = _recs.run_analysis(
                                 rec,
                                 result.mf_data,
                                 result.garmin_data,
@@ -1491,20 +1757,14 @@ with tab_smart:
 
     # ── Phase 2 — Performance-First Analysis ─────────────────────────────────
     elif rec.phase == 2:
-        st.markdown(_phase_bar(2), unsafe_allow_html=True)
-        st.markdown(
-            _html_section_header(
-                "Performance-First Analysis",
-                "AI synthesis of your Garmin data, nutrition, and biofeedback.",
-            ),
-            unsafe_allow_html=True,
-        )
+        st.markdown(_PHASE_BAR_HTML[1], unsafe_allow_html=True)
+        st.markdown(_HDR_ANALYSIS, unsafe_allow_html=True)
 
         col_main, col_chat = st.columns([2, 1], gap="large")
         with col_main:
             st.markdown(rec.analysis_text)
             st.divider()
-            col_fwd, col_bk = st.columns([3, 1], gap="medium")
+            col_fwd, col_rg, col_bk = st.columns([3, 1, 1], gap="medium")
             with col_fwd:
                 if st.button("Generate Strategy Proposal →", type="primary", use_container_width=True):
                     if not _api_key():
@@ -1513,7 +1773,7 @@ with tab_smart:
                         _err = None
                         with st.spinner("Drafting strategy proposal…"):
                             try:
-                                rec.proposal_text = run_proposal(rec, _api_key())
+                                rec.proposal_text = _recs.run_proposal(rec, _api_key())
                                 rec.phase = 3
                                 _persist_save_rec()
                             except Exception as exc:
@@ -1522,6 +1782,28 @@ with tab_smart:
                             st.error(f"Proposal failed: {_err}", icon="🚨")
                         else:
                             st.rerun()
+            with col_rg:
+                # Same inputs replay the cached analysis; this asks for a fresh one
+                if st.button("↻ Regenerate", key="regen_analysis", use_container_width=True):
+                    _err = None
+                    with st.spinner("Re-running the analysis…"):
+                        try:
+                            rec.analysis_text = _recs.run_analysis(
+                                rec,
+                                result.mf_data,
+                                result.garmin_data,
+                                result.week_start,
+                                result.week_end,
+                                _api_key(),
+                                refresh=True,
+                            )
+                            _persist_save_rec()
+                        except Exception as exc:
+                            _err = str(exc)
+                    if _err:
+                        st.error(f"Analysis failed: {_err}", icon="🚨")
+                    else:
+                        st.rerun()
             with col_bk:
                 if st.button("← Edit Interview", use_container_width=True):
                     rec.phase = 1
@@ -1531,14 +1813,8 @@ with tab_smart:
 
     # ── Phase 3 — Strategy Proposal ──────────────────────────────────────────
     elif rec.phase == 3:
-        st.markdown(_phase_bar(3), unsafe_allow_html=True)
-        st.markdown(
-            _html_section_header(
-                "Strategy Proposal",
-                "Review and approve the plan — discuss meal preferences with the coach before generating.",
-            ),
-            unsafe_allow_html=True,
-        )
+        st.markdown(_PHASE_BAR_HTML[2], unsafe_allow_html=True)
+        st.markdown(_HDR_PROPOSAL, unsafe_allow_html=True)
 
         col_main, col_chat = st.columns([2, 1], gap="large")
         with col_main:
@@ -1551,7 +1827,7 @@ with tab_smart:
             )
             rec.use_new_meals = use_new
 
-            col_app, col_rev, col_rst = st.columns([3, 2, 1], gap="medium")
+            col_app, col_rg, col_rev, col_rst = st.columns([3, 1, 2, 1], gap="medium")
             with col_app:
                 if st.button("✅  Approve & Generate Weekly Plan", type="primary", use_container_width=True):
                     if not _api_key():
@@ -1560,7 +1836,7 @@ with tab_smart:
                         _err = None
                         with st.spinner("Building your personalised 7-day plan…"):
                             try:
-                                rec.week_template_md = run_template(rec, _api_key())
+                                rec.week_template_md = _recs.run_template(rec, _api_key())
                                 rec.phase = 4
                                 _persist_save_rec()
                             except Exception as exc:
@@ -1569,13 +1845,26 @@ with tab_smart:
                             st.error(f"Template generation failed: {_err}", icon="🚨")
                         else:
                             st.rerun()
+            with col_rg:
+                if st.button("↻ Regenerate", key="regen_proposal", use_container_width=True):
+                    _err = None
+                    with st.spinner("Redrafting the proposal…"):
+                        try:
+                            rec.proposal_text = _recs.run_proposal(rec, _api_key(), refresh=True)
+                            _persist_save_rec()
+                        except Exception as exc:
+                            _err = str(exc)
+                    if _err:
+                        st.error(f"Proposal failed: {_err}", icon="🚨")
+                    else:
+                        st.rerun()
             with col_rev:
                 if st.button("← Revise Analysis", use_container_width=True):
                     rec.phase = 1
                     st.rerun()
             with col_rst:
                 if st.button("🔄 Reset", use_container_width=True):
-                    st.session_state.rec = InterviewState(phase=0)
+                    st.session_state.rec = _recs.InterviewState(phase=0)
                     _persist_save_rec()
                     st.rerun()
 
@@ -1598,36 +1887,41 @@ with tab_smart:
 
     # ── Phase 4 — Weekly Plan ────────────────────────────────────────────────
     elif rec.phase == 4:
-        from peakform.recommendations import run_plan_update
-
-        st.markdown(_phase_bar(4), unsafe_allow_html=True)
-        st.markdown(
-            _html_section_header(
-                "Your Weekly Plan",
-                "Macro-verified · ready to execute · discuss changes with the coach to update.",
-            ),
-            unsafe_allow_html=True,
-        )
+
+        st.markdown(_PHASE_BAR_HTML[3], unsafe_allow_html=True)
+        st.markdown(_HDR_WEEKLY_PLAN, unsafe_allow_html=True)
 
         col_main, col_chat = st.columns([2, 1], gap="large")
         with col_main:
             st.markdown(rec.week_template_md)
             st.divider()
-            from datetime import date as _date
             filename = f"peakform_plan_{_date.today().strftime('%Y-%m-%d')}.md"
-            col_dl, col_rst2 = st.columns([3, 1], gap="medium")
+            col_dl, col_rg, col_rst2 = st.columns([3, 1, 1], gap="medium")
             with col_dl:
                 st.download_button(
                     label="⬇️  Download Weekly Plan (.md)",
-                    data=rec.week_template_md,
+                    data=_utf8(rec.week_template_md),
                     file_name=filename,
                     mime="text/markdown",
                     use_container_width=True,
                     type="primary",
                 )
+            with col_rg:
+                if st.button("↻ Regenerate", key="regen_template", use_container_width=True):
+                    _err = None
+                    with st.spinner("Rebuilding your 7-day plan…"):
+                        try:
+                            rec.week_template_md = _recs.run_template(rec, _api_key(), refresh=True)
+                            _persist_save_rec()
+                        except Exception as exc:
+                            _err = str(exc)
+                    if _err:
+                        st.error(f"Template generation failed: {_err}", icon="🚨")
+                    else:
+                        st.rerun()
             with col_rst2:
                 if st.button("🔄  New Week", use_container_width=True):
-                    st.session_state.rec = InterviewState(phase=0)
+                    st.session_state.rec = _recs.InterviewState(phase=0)
                     _persist_save_rec()
                     st.rerun()
 
@@ -1663,7 +1957,7 @@ with tab_smart:
                         _err = None
                         with st.spinner("Regenerating plan with your changes…"):
                             try:
-                                rec.week_template_md = run_plan_update(rec, _api_key())
+                                rec.week_template_md = _recs.run_plan_update(rec, _api_key())
                                 _persist_save_rec()
                             except Exception as exc:
                                 _err = str(exc)
@@ -6,15 +6,16 @@ for the specified week, and returns the formatted weekly report.
 
 from __future__ import annotations
 
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import pandas as pd
 
-from peakform.parsers import macrofactor, garmin
-from peakform.analyzers import running, strength, nutrition, body_comp, signals
-from peakform.report import formatter
+if TYPE_CHECKING:
+    from peakform.parsers import macrofactor, garmin
 
 
 @dataclass
@@ -31,14 +32,7 @@ class RunResult:
 # Week boundary helpers
 # ---------------------------------------------------------------------------
 
-def _current_week_bounds() -> tuple[pd.Timestamp, pd.Timestamp]:
-    """Return Mon–Sun bounds for the current calendar week."""
-    today = date.today()
-    monday = today - timedelta(days=today.weekday())
-    sunday = monday + timedelta(days=6)
-    return pd.Timestamp(monday), pd.Timestamp(sunday)
-
-
+@functools.lru_cache(maxsize=64)
 def _week_bounds_for_date(target: date) -> tuple[pd.Timestamp, pd.Timestamp]:
     """Return the Mon–Sun week containing the given date."""
     monday = target - timedelta(days=target.weekday())
@@ -46,6 +40,11 @@ def _week_bounds_for_date(target: date) -> tuple[pd.Timestamp, pd.Timestamp]:
     return pd.Timestamp(monday), pd.Timestamp(sunday)
 
 
+def _current_week_bounds() -> tuple[pd.Timestamp, pd.Timestamp]:
+    """Return Mon–Sun bounds for the current calendar week."""
+    return _week_bounds_for_date(date.today())
+
+
 def _parse_week_arg(week_str: Optional[str]) -> tuple[pd.Timestamp, pd.Timestamp]:
     """Parse a user-supplied week string (YYYY-MM-DD) into Mon–Sun bounds.
 
@@ -79,7 +78,9 @@ def _validate_data_coverage(
     # MacroFactor: logged days
     cm_df = mf_data.calories_macros
     if not cm_df.empty:
-        week_cm = cm_df[(cm_df["date"] >= week_start) & (cm_df["date"] <= week_end)]
+        dates = cm_df["date"].to_numpy()
+        in_week = (dates >= week_start.to_datetime64()) & (dates <= week_end.to_datetime64())
+        week_cm = cm_df[in_week]
         logged_days = len(week_cm)
         if logged_days < 5:
             warnings.append(
@@ -92,12 +93,8 @@ def _validate_data_coverage(
     # Garmin: gap detection
     runs = garmin_data.runs_in_window(week_start, week_end)
     if not runs.empty:
-        dates = runs["date"].dt.date.tolist()
-        dates_sorted = sorted(set(dates))
-        max_gap = 0
-        for i in range(1, len(dates_sorted)):
-            gap = (dates_sorted[i] - dates_sorted[i - 1]).days
-            max_gap = max(max_gap, gap)
+        days = runs["date"].dt.normalize().drop_duplicates().sort_values()
+        max_gap = int(days.diff().dt.days.max()) if len(days) > 1 else 0
         if max_gap > 2:
             warnings.append(
                 f"Garmin: gap of {max_gap} days between run activities — "
@@ -109,25 +106,25 @@ def _validate_data_coverage(
     # Anomaly checks
     if not cm_df.empty and not runs.empty:
         # Single-day calorie spike >3000
-        week_cm_all = cm_df[(cm_df["date"] >= week_start) & (cm_df["date"] <= week_end)]
-        cal_col = next(
-            (c for c in week_cm_all.columns if "calorie" in c.lower() or "kcal" in c.lower()),
-            None,
-        )
+        cal_col = mf_data.calorie_col
         if cal_col:
-            spikes = week_cm_all[week_cm_all[cal_col] > 3000]
-            for _, row in spikes.iterrows():
+            spikes = week_cm[week_cm[cal_col] > 3000]
+            for kcal, day in zip(
+                spikes[cal_col].to_numpy(), spikes["date"].dt.strftime("%a %b %d")
+            ):
                 warnings.append(
-                    f"⚠️ Calorie spike: {row[cal_col]:.0f} kcal on "
-                    f"{row['date'].strftime('%a %b %d')} (>3,000 kcal threshold)."
+                    f"⚠️ Calorie spike: {kcal:.0f} kcal on "
+                    f"{day} (>3,000 kcal threshold)."
                 )
 
         # Single run >15 mi
         long_runs = runs[runs["distance_mi"] > 15]
-        for _, row in long_runs.iterrows():
+        for miles, day in zip(
+            long_runs["distance_mi"].to_numpy(), long_runs["date"].dt.strftime("%a %b %d")
+        ):
             warnings.append(
-                f"⚠️ Long run: {row['distance_mi']:.1f} mi on "
-                f"{row['date'].strftime('%a %b %d')} (>15 mi threshold)."
+                f"⚠️ Long run: {miles:.1f} mi on "
+                f"{day} (>15 mi threshold)."
             )
 
     return warnings
@@ -158,6 +155,12 @@ def run_full(
     """
     import sys
 
+    # Deferred so importing this module (e.g. for the week helpers) doesn't
+    # pull in openpyxl and every analyzer up front.
+    from peakform.parsers import macrofactor, garmin
+    from peakform.analyzers import running, strength, nutrition, body_comp, signals
+    from peakform.report import formatter
+
     def _log(msg: str):
         if verbose:
             print(f"[peakform] {msg}", file=sys.stderr)
@@ -193,11 +196,13 @@ def run_full(
     # ------------------------------------------------------------------
     # Run analyzers
     # ------------------------------------------------------------------
-    _log("Running analysis: running metrics...")
-    running_analysis = running.analyze(garmin_data, week_start, week_end)
-
-    _log("Running analysis: strength training...")
-    strength_analysis = strength.analyze(mf_data, week_start, week_end)
+    # Running (Garmin) and strength (MacroFactor) touch disjoint data, so
+    # strength runs on a worker while running metrics compute here.
+    _log("Running analysis: running metrics + strength training...")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        strength_future = pool.submit(strength.analyze, mf_data, week_start, week_end)
+        running_analysis = running.analyze(garmin_data, week_start, week_end)
+        strength_analysis = strength_future.result()
 
     _log("Running analysis: nutrition...")
     nutrition_analysis = nutrition.analyze(
@@ -238,7 +243,7 @@ def run_full(
     # Prepend any coverage warnings
     if coverage_warnings:
         warn_block = "\n".join(f"> ⚠️ {w}" for w in coverage_warnings)
-        report_md = f"---\n**Data Coverage Warnings:**\n{warn_block}\n\n---\n\n" + report_md
+        report_md = f"---\n**Data Coverage Warnings:**\n{warn_block}\n\n---\n\n{report_md}"
 
     _log("Done.")
     return RunResult(
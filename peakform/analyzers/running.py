@@ -114,7 +114,7 @@ def _compute_week_stats(
 
     window = all_runs[
         (all_runs["date"] >= week_start) & (all_runs["date"] <= week_end)
-    ].copy()
+    ]
 
     if window.empty:
         return stats
@@ -127,7 +127,8 @@ def _compute_week_stats(
         stats.longest_run_miles = window["distance_mi"].max()
 
     # Flat runs
-    flat = window[window["is_trail"] == False].copy()  # noqa: E712
+    is_trail = window["is_trail"].to_numpy(dtype=bool)
+    flat = window[~is_trail]
     stats.flat_run_count = len(flat)
 
     if not flat.empty:
@@ -152,7 +153,7 @@ def _compute_week_stats(
             stats.hr_pace_efficiency = stats.flat_avg_hr / stats.flat_avg_pace_dec
 
     # Trail runs
-    trail = window[window["is_trail"] == True].copy()  # noqa: E712
+    trail = window[is_trail]
     stats.trail_run_count = len(trail)
     if not trail.empty:
         stats.trail_total_miles = trail["distance_mi"].sum(skipna=True)
@@ -66,8 +66,48 @@ def _col(df: pd.DataFrame, *keywords) -> Optional[str]:
     return None
 
 
+# ---------------------------------------------------------------------------
+# Point thinning for long daily series
+# ---------------------------------------------------------------------------
+
+_MAX_POINTS = 2000
+
+
+def _m4(df: pd.DataFrame, y: str, max_points: int = _MAX_POINTS) -> pd.DataFrame:
+    """Thin a date-sorted frame to at most max_points rows for plotting.
+
+    M4 aggregation: the rows are split into max_points/4 equal buckets and
+    each keeps its first, last, min and max row, so the drawn shape (spikes
+    included) matches the full series. Shorter frames are returned as-is.
+    """
+    n = len(df)
+    if n <= max_points:
+        return df
+    vals = df[y].to_numpy(dtype=float)
+    edges = np.linspace(0, n, max_points // 4 + 1).astype(int)
+    keep = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            seg = vals[lo:hi]
+            keep += [lo, hi - 1, lo + int(np.argmin(seg)), lo + int(np.argmax(seg))]
+    return df.iloc[np.unique(keep)]
+
+
+def _week_start(dates: pd.Series) -> pd.Series:
+    """Monday 00:00 of each date's week — to_period("W").start_time without Periods.
+
+    A bare datetime64[W] cast can't be used: numpy weeks start on Thursday.
+    """
+    days = dates.dt.normalize()
+    return days - pd.to_timedelta(days.dt.dayofweek, unit="D")
+
+
+# Validated once; go.Figure copies it, so each empty figure stays independent.
+_EMPTY_LAYOUT = go.Layout(**_BASE, height=220)
+
+
 def _empty_fig(message: str) -> go.Figure:
-    fig = go.Figure()
+    fig = go.Figure(layout=_EMPTY_LAYOUT)
     fig.add_annotation(
         text=message,
         xref="paper", yref="paper",
@@ -75,7 +115,6 @@ def _empty_fig(message: str) -> go.Figure:
         showarrow=False,
         font=dict(size=14, color=_MUTED),
     )
-    fig.update_layout(**_BASE, height=220)
     return fig
 
 
@@ -87,6 +126,18 @@ def _fmt_pace(decimal_minutes: float) -> str:
     return f"{total_sec // 60}:{total_sec % 60:02d}/mi"
 
 
+def _fmt_paces(values) -> list:
+    """Vectorised _fmt_pace for a whole column of hover labels."""
+    arr = np.asarray(values, dtype=float)
+    missing = np.isnan(arr)
+    total_sec = np.where(missing, 0, np.round(arr * 60)).astype(int)
+    mins, secs = np.divmod(total_sec, 60)
+    return [
+        "--" if na else f"{m}:{s:02d}/mi"
+        for na, m, s in zip(missing.tolist(), mins.tolist(), secs.tolist())
+    ]
+
+
 # ---------------------------------------------------------------------------
 # 1. Weight Trend
 # ---------------------------------------------------------------------------
@@ -101,8 +152,8 @@ def weight_trend_chart(mf_data) -> go.Figure:
     if not scale_df.empty:
         w_col = _col(scale_df, "weight")
         if w_col:
-            valid = scale_df.dropna(subset=[w_col])
-            fig.add_trace(go.Scatter(
+            valid = _m4(scale_df.dropna(subset=[w_col]), w_col)
+            fig.add_trace(go.Scattergl(
                 x=valid["date"],
                 y=valid[w_col],
                 mode="markers",
@@ -114,8 +165,8 @@ def weight_trend_chart(mf_data) -> go.Figure:
     if not trend_df.empty:
         t_col = _col(trend_df, "trend", "weight")
         if t_col:
-            valid = trend_df.dropna(subset=[t_col])
-            fig.add_trace(go.Scatter(
+            valid = _m4(trend_df.dropna(subset=[t_col]), t_col)
+            fig.add_trace(go.Scattergl(
                 x=valid["date"],
                 y=valid[t_col],
                 mode="lines",
@@ -165,20 +216,16 @@ def weekly_mileage_chart(garmin_data) -> go.Figure:
     if runs.empty:
         return _empty_fig("No running data available")
 
-    runs = runs.copy()
-    runs["week"] = runs["date"].dt.to_period("W").dt.start_time
-
-    flat = (
-        runs[runs["is_trail"] == False]  # noqa: E712
-        .groupby("week")["distance_mi"]
-        .sum()
-        .reset_index()
-    )
-    trail = (
-        runs[runs["is_trail"] == True]  # noqa: E712
-        .groupby("week")["distance_mi"]
-        .sum()
-        .reset_index()
+    # One groupby for both surfaces; a side with no runs simply has no rows.
+    week = _week_start(runs["date"]).rename("week")
+    by_surface = runs.groupby([runs["is_trail"], week])["distance_mi"].sum()
+    empty = pd.DataFrame({
+        "week": pd.Series(dtype="datetime64[ns]"),
+        "distance_mi": pd.Series(dtype=float),
+    })
+    flat, trail = (
+        by_surface.xs(side).reset_index() if side in by_surface.index.levels[0] else empty
+        for side in (False, True)
     )
 
     fig = go.Figure()
@@ -217,26 +264,24 @@ def calories_vs_target_chart(mf_data, days: int = 60) -> go.Figure:
     if cm.empty:
         return _empty_fig("No calorie data available")
 
-    cal_col = _col(cm, "calorie", "kcal", "energy")
+    cal_col = mf_data.col_alias["calories"]
     if not cal_col:
         return _empty_fig("Could not locate calorie column")
 
     cutoff = cm["date"].max() - pd.Timedelta(days=days)
-    df = cm[cm["date"] >= cutoff][["date", cal_col]].dropna(subset=[cal_col]).copy()
+    df = cm.loc[(cm["date"] >= cutoff) & cm[cal_col].notna(), ["date", cal_col]]
     df = df.rename(columns={cal_col: "calories"})
 
     targets = mf_data.get_current_targets()
     target_cal = targets["calories"]
     expenditure_cal = targets["expenditure_kcal"]
 
-    colors = []
-    for c in df["calories"]:
-        if abs(c - target_cal) <= CALORIE_ADHERENCE_WINDOW_KCAL:
-            colors.append(_SUCCESS)
-        elif c > expenditure_cal:
-            colors.append(_DANGER)
-        else:
-            colors.append(_MUTED)
+    cal = df["calories"].to_numpy(dtype=float)
+    colors = np.select(
+        [np.abs(cal - target_cal) <= CALORIE_ADHERENCE_WINDOW_KCAL, cal > expenditure_cal],
+        [_SUCCESS, _DANGER],
+        default=_MUTED,
+    ).tolist()
 
     fig = go.Figure()
     fig.add_trace(go.Bar(
@@ -281,34 +326,25 @@ def weekly_deficit_chart(mf_data) -> go.Figure:
     if cm.empty:
         return _empty_fig("No calorie data available")
 
-    cal_col = _col(cm, "calorie", "kcal", "energy")
+    cal_col = mf_data.col_alias["calories"]
     if not cal_col:
         return _empty_fig("Could not locate calorie column")
 
-    df = cm[["date", cal_col]].dropna(subset=[cal_col]).copy()
-    df["week"] = df["date"].dt.to_period("W").dt.start_time
-    weekly_intake = df.groupby("week")[cal_col].mean()
+    intake = cm[cal_col].dropna()
+    weekly_intake = intake.groupby(_week_start(cm["date"])).mean()
 
     exp_df = mf_data.expenditure
-    if not exp_df.empty:
-        exp_col = _col(exp_df, "expenditure", "tdee", "total")
-        if exp_col:
-            edf = exp_df[["date", exp_col]].dropna(subset=[exp_col]).copy()
-            edf["week"] = edf["date"].dt.to_period("W").dt.start_time
-            weekly_exp = edf.groupby("week")[exp_col].mean()
-            common = weekly_intake.index.intersection(weekly_exp.index)
-            balance = (weekly_intake[common] - weekly_exp[common]).reset_index()
-            balance.columns = ["week", "balance"]
-        else:
-            tdee = mf_data.get_current_targets()["expenditure_kcal"]
-            balance = (weekly_intake - tdee).reset_index()
-            balance.columns = ["week", "balance"]
+    exp_col = _col(exp_df, "expenditure", "tdee", "total") if not exp_df.empty else None
+    if exp_col:
+        exp = exp_df[exp_col]
+        weekly_exp = exp.groupby(_week_start(exp_df["date"])).mean()
+        # Subtraction aligns on week; weeks missing either side drop out.
+        weekly_balance = (weekly_intake - weekly_exp).dropna()
     else:
-        tdee = mf_data.get_current_targets()["expenditure_kcal"]
-        balance = (weekly_intake - tdee).reset_index()
-        balance.columns = ["week", "balance"]
+        weekly_balance = weekly_intake - mf_data.get_current_targets()["expenditure_kcal"]
+    balance = weekly_balance.rename_axis("week").reset_index(name="balance")
 
-    colors = [_DANGER if v > 0 else _SUCCESS for v in balance["balance"]]
+    colors = np.where(balance["balance"].to_numpy(dtype=float) > 0, _DANGER, _SUCCESS).tolist()
 
     fig = go.Figure()
     fig.add_trace(go.Bar(
@@ -338,16 +374,16 @@ def protein_adherence_chart(mf_data, days: int = 60) -> go.Figure:
     if cm.empty:
         return _empty_fig("No nutrition data available")
 
-    prot_col = _col(cm, "protein")
+    prot_col = mf_data.col_alias["protein"]
     if not prot_col:
         return _empty_fig("Could not locate protein column")
 
     cutoff = cm["date"].max() - pd.Timedelta(days=days)
-    df = cm[cm["date"] >= cutoff][["date", prot_col]].dropna(subset=[prot_col]).copy()
+    df = cm.loc[(cm["date"] >= cutoff) & cm[prot_col].notna(), ["date", prot_col]]
     df = df.rename(columns={prot_col: "protein_g"})
 
     target_prot = mf_data.get_current_targets()["protein_g"]
-    colors = [_SUCCESS if p >= target_prot else _DANGER for p in df["protein_g"]]
+    colors = np.where(df["protein_g"].to_numpy(dtype=float) >= target_prot, _SUCCESS, _DANGER).tolist()
 
     fig = go.Figure()
     fig.add_trace(go.Bar(
@@ -384,29 +420,29 @@ def pace_trend_chart(garmin_data) -> go.Figure:
     if flat.empty or "avg_pace" not in flat.columns:
         return _empty_fig("No flat-run pace data available")
 
-    df = flat[["date", "avg_pace", "distance_mi"]].dropna(subset=["avg_pace"]).copy()
-    df = df.sort_values("date")
+    df = flat[["date", "avg_pace", "distance_mi"]].dropna(subset=["avg_pace"]).sort_values("date")
     df["rolling"] = df["avg_pace"].rolling(4, min_periods=2).mean()
+    df = _m4(df, "avg_pace")
 
     tick_vals = np.linspace(df["avg_pace"].min(), df["avg_pace"].max(), 8)
 
     fig = go.Figure()
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=df["date"],
         y=df["avg_pace"],
         mode="markers",
         name="Per-run pace",
         marker=dict(color=_PRIMARY, size=7, opacity=0.75),
-        customdata=[_fmt_pace(v) for v in df["avg_pace"]],
+        customdata=_fmt_paces(df["avg_pace"]),
         hovertemplate="%{x|%b %d}: %{customdata}<extra></extra>",
     ))
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=df["date"],
         y=df["rolling"],
         mode="lines",
         name="4-run avg",
         line=dict(color=_WARNING, width=2.5),
-        customdata=[_fmt_pace(v) for v in df["rolling"]],
+        customdata=_fmt_paces(df["rolling"]),
         hovertemplate="%{x|%b %d}: %{customdata}<extra></extra>",
     ))
 
@@ -420,7 +456,7 @@ def pace_trend_chart(garmin_data) -> go.Figure:
         range=[y_max + pad, y_min - pad],
         gridcolor=_GRID,
         tickvals=tick_vals,
-        ticktext=[_fmt_pace(v) for v in tick_vals],
+        ticktext=_fmt_paces(tick_vals),
     ))
     return fig
 
@@ -444,22 +480,24 @@ def muscle_group_chart(
     if week_df.empty:
         return _empty_fig("No strength data found for this week")
 
-    muscle_cols = [c for c in week_df.columns if c != "date"]
-    totals = week_df[muscle_cols].sum().dropna()
-    totals = totals[totals > 0].sort_values(ascending=True)
+    muscle_cols = np.array([c for c in week_df.columns if c != "date"], dtype=object)
+    sums = np.nansum(week_df[muscle_cols].to_numpy(dtype=float), axis=0)
+    logged = sums > 0
+    order = np.argsort(sums[logged], kind="stable")
+    totals, names = sums[logged][order], muscle_cols[logged][order].tolist()
 
-    if totals.empty:
+    if not names:
         return _empty_fig("No sets logged this week")
 
     colors = [
         _SUCCESS if name in PRIORITY_MUSCLE_GROUPS else _PRIMARY
-        for name in totals.index
+        for name in names
     ]
 
     fig = go.Figure()
     fig.add_trace(go.Bar(
-        x=totals.values,
-        y=totals.index,
+        x=totals,
+        y=names,
         orientation="h",
         marker_color=colors,
         hovertemplate="%{y}: %{x:.0f} sets<extra></extra>",
@@ -482,6 +520,42 @@ def muscle_group_chart(
 # 8. Plan Adherence Scorecard
 # ---------------------------------------------------------------------------
 
+_ADHERENCE_METRICS = (
+    ("Calories on target", "calorie_adherence", "calorie_label"),
+    ("Protein target", "protein_adherence", "protein_label"),
+    ("Runs logged", "run_adherence", "run_label"),
+    ("Strength sessions", "strength_adherence", "strength_label"),
+)
+
+_GAUGE_AXIS = dict(range=[0, 100], tickcolor=_GRID, tickfont=dict(color=_MUTED))
+_GAUGE_STEPS = [
+    dict(range=[0, 50], color="#1A0808"),
+    dict(range=[50, 80], color="#1A1200"),
+    dict(range=[80, 100], color="#081A08"),
+]
+
+
+def _adherence_gauge(label: str, pct: float, sub: str, column: int) -> go.Indicator:
+    bar_color = _SUCCESS if pct >= 80 else (_WARNING if pct >= 50 else _DANGER)
+    return go.Indicator(
+        mode="gauge+number",
+        value=pct,
+        number=dict(suffix="%", font=dict(color=_TEXT, size=22)),
+        title=dict(
+            text=f"<b>{label}</b><br><span style='font-size:0.75em;color:{_MUTED}'>{sub}</span>",
+            font=dict(color=_TEXT, size=13),
+        ),
+        gauge=dict(
+            axis=_GAUGE_AXIS,
+            bar=dict(color=bar_color),
+            bgcolor=_SURFACE,
+            bordercolor=_GRID,
+            steps=_GAUGE_STEPS,
+        ),
+        domain=dict(row=0, column=column),
+    )
+
+
 def adherence_scorecard(
     mf_data,
     garmin_data,
@@ -503,10 +577,10 @@ def adherence_scorecard(
     cm = mf_data.calories_macros
     if not cm.empty:
         mask = (cm["date"] >= week_start) & (cm["date"] <= week_end)
-        week_cm = cm[mask].copy()
+        week_cm = cm[mask]
 
-        cal_col = _col(week_cm, "calorie", "kcal", "energy")
-        prot_col = _col(week_cm, "protein")
+        cal_col = mf_data.col_alias["calories"]
+        prot_col = mf_data.col_alias["protein"]
 
         if cal_col and not week_cm.empty:
             cal_vals = week_cm[cal_col].dropna()
@@ -542,40 +616,11 @@ def adherence_scorecard(
     scores["strength_adherence"] = min(str_count / 2.0, 1.0) * 100
     scores["strength_label"] = f"{str_count} session{'s' if str_count != 1 else ''}"
 
-    # Build 4-gauge figure
-    metrics = [
-        ("Calories on target", "calorie_adherence", "calorie_label"),
-        ("Protein target", "protein_adherence", "protein_label"),
-        ("Runs logged", "run_adherence", "run_label"),
-        ("Strength sessions", "strength_adherence", "strength_label"),
-    ]
-
-    fig = go.Figure()
-    for i, (label, score_key, label_key) in enumerate(metrics):
-        pct = scores[score_key]
-        sub = scores[label_key]
-        bar_color = _SUCCESS if pct >= 80 else (_WARNING if pct >= 50 else _DANGER)
-        fig.add_trace(go.Indicator(
-            mode="gauge+number",
-            value=pct,
-            number=dict(suffix="%", font=dict(color=_TEXT, size=22)),
-            title=dict(
-                text=f"<b>{label}</b><br><span style='font-size:0.75em;color:{_MUTED}'>{sub}</span>",
-                font=dict(color=_TEXT, size=13),
-            ),
-            gauge=dict(
-                axis=dict(range=[0, 100], tickcolor=_GRID, tickfont=dict(color=_MUTED)),
-                bar=dict(color=bar_color),
-                bgcolor=_SURFACE,
-                bordercolor=_GRID,
-                steps=[
-                    dict(range=[0, 50], color="#1A0808"),
-                    dict(range=[50, 80], color="#1A1200"),
-                    dict(range=[80, 100], color="#081A08"),
-                ],
-            ),
-            domain=dict(row=0, column=i),
-        ))
+    # Build 4-gauge figure in one go (a single validation pass over the traces)
+    fig = go.Figure(data=[
+        _adherence_gauge(label, scores[score_key], scores[label_key], i)
+        for i, (label, score_key, label_key) in enumerate(_ADHERENCE_METRICS)
+    ])
 
     fig.update_layout(
         paper_bgcolor=_BG,
@@ -7,13 +7,55 @@ specific, data-backed questions about their training and nutrition.
 
 from __future__ import annotations
 
+import copy
 import os
-from typing import Optional
+import re
+from collections import deque
+from typing import Iterator, Optional
 
 import pandas as pd
 
 _DEFAULT_MODEL = "claude-haiku-4-5-20251001"
 
+# Long conversations send the latest turns verbatim plus the earlier turns
+# that share the most vocabulary with the new question, not the whole log.
+_RECENT_TURNS = 2
+_RECALLED_TURNS = 5
+
+# The agent's own transcript is a ring buffer; turns are recorded in
+# user/assistant pairs, so an even bound never splits an exchange.
+_HISTORY_LEN = 50
+
+_WORD_RE = re.compile(r"[a-z0-9]{3,}")
+
+# The system prompt lists the last two Mon–Sun weeks day by day; the rest
+# of the 30-day window is collapsed to one summary line per week.
+_DETAIL_DAYS = 14
+
+
+def _week_of(dates: pd.Series) -> pd.Series:
+    """Monday of each date's week."""
+    days = dates.dt.normalize()
+    return days - pd.to_timedelta(days.dt.dayofweek, unit="D")
+
+
+def _split_detail(
+    df: pd.DataFrame, week_end: pd.Timestamp
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Split a dated frame into (older, recent) at the start of the detail weeks."""
+    start = week_end.normalize() - pd.Timedelta(days=_DETAIL_DAYS - 1)
+    start -= pd.Timedelta(days=start.dayofweek)
+    recent = df["date"] >= start
+    return df[~recent], df[recent]
+
+
+def _fmt_col(df: pd.DataFrame, col: Optional[str], fmt: str, div: float = 1) -> list:
+    """Format one numeric column for a Markdown table; "—" where missing."""
+    if not col or col not in df.columns:
+        return ["—"] * len(df)
+    vals = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float)
+    return ["—" if v != v else f"{v / div:{fmt}}" for v in vals.tolist()]
+
 
 class PeakFormAgent:
     """Stateful Q&A agent grounded in the user's fitness & nutrition data.
@@ -32,6 +74,9 @@ class PeakFormAgent:
         Anthropic API key.  Falls back to the ANTHROPIC_API_KEY env var.
     model : str
         Anthropic model ID.  Defaults to claude-haiku-4-5 for low latency.
+    client : anthropic.Anthropic, optional
+        Existing client to reuse (and its connection pool).  When given,
+        ``api_key`` is ignored.
     """
 
     def __init__(
@@ -43,23 +88,31 @@ class PeakFormAgent:
         week_end: pd.Timestamp,
         api_key: Optional[str] = None,
         model: str = _DEFAULT_MODEL,
+        client=None,
     ):
         self._model = model
-        self._history: list[dict] = []
-
-        key = api_key or os.environ.get("ANTHROPIC_API_KEY")
-        if not key:
-            raise ValueError(
-                "No Anthropic API key found.\n"
-                "Add ANTHROPIC_API_KEY to Colab Secrets (🔑 sidebar) and toggle "
-                "'Notebook access' ON, then re-run the setup cell."
-            )
+        self._history: deque = deque(maxlen=_HISTORY_LEN)
+
+        if client is None:
+            key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+            if not key:
+                raise ValueError(
+                    "No Anthropic API key found.\n"
+                    "Add ANTHROPIC_API_KEY to Colab Secrets (🔑 sidebar) and toggle "
+                    "'Notebook access' ON, then re-run the setup cell."
+                )
 
-        import anthropic
-        self._client = anthropic.Anthropic(api_key=key)
+            import anthropic
+            client = anthropic.Anthropic(api_key=key)
+        self._client = client
         self._system = self._build_system(
             report_md, mf_data, garmin_data, week_start, week_end
         )
+        # The data context never changes for an agent — mark it cacheable so
+        # follow-up turns reuse the server-side prompt cache.
+        self._system_blocks = [
+            {"type": "text", "text": self._system, "cache_control": {"type": "ephemeral"}}
+        ]
 
     # ------------------------------------------------------------------
     # Public API
@@ -67,20 +120,90 @@ class PeakFormAgent:
 
     def chat(self, message: str) -> str:
         """Send a user message and return the model's response."""
+        response = self._client.messages.create(**self._request(message))
+        reply = response.content[0].text
+        self._record(message, reply)
+        return reply
+
+    def chat_stream(self, message: str) -> Iterator[str]:
+        """Like :meth:`chat`, but yield the reply's text as it arrives.
+
+        The exchange is added to the history only once the stream is
+        exhausted; an error or an abandoned generator leaves it untouched.
+        """
+        parts = []
+        with self._client.messages.stream(**self._request(message)) as stream:
+            for text in stream.text_stream:
+                parts.append(text)
+                yield text
+        self._record(message, "".join(parts))
+
+    def _record(self, message: str, reply: str):
         self._history.append({"role": "user", "content": message})
-        response = self._client.messages.create(
+        self._history.append({"role": "assistant", "content": reply})
+
+    def _request(self, message: str) -> dict:
+        """Build the Messages API arguments for *message*.
+
+        While the whole history is sent, the newest user turn carries a cache
+        breakpoint so the next call only processes the turns added since.
+        Once older turns are recalled by relevance the prefix changes from
+        call to call, so only the system prompt stays cached.
+        """
+        context, stable = self._context(message)
+        text = {"type": "text", "text": message}
+        if stable:
+            text["cache_control"] = {"type": "ephemeral"}
+        messages = context + [{"role": "user", "content": [text]}]
+        return dict(
             model=self._model,
             max_tokens=1024,
-            system=self._system,
-            messages=self._history,
+            system=self._system_blocks,
+            messages=messages,
         )
-        reply = response.content[0].text
-        self._history.append({"role": "assistant", "content": reply})
-        return reply
 
     def reset(self):
         """Clear conversation history while keeping the data context."""
-        self._history = []
+        self._history = deque(maxlen=_HISTORY_LEN)
+
+    def fork(self) -> "PeakFormAgent":
+        """Return a new agent sharing this one's client and system prompt,
+        with an empty conversation history."""
+        clone = copy.copy(self)
+        clone._history = deque(maxlen=_HISTORY_LEN)
+        return clone
+
+    def _turns(self) -> list[list[dict]]:
+        """The history grouped into exchanges, each starting at a user message."""
+        turns: list[list[dict]] = []
+        for m in self._history:
+            if m["role"] == "user" or not turns:
+                turns.append([m])
+            else:
+                turns[-1].append(m)
+        return turns
+
+    def _context(self, message: str) -> tuple[list[dict], bool]:
+        """Prior turns to send with *message*, and whether that is the whole history.
+
+        Short conversations go out whole.  Past ``_RECENT_TURNS +
+        _RECALLED_TURNS`` exchanges, the most recent ones are kept and the
+        rest are ranked by word overlap with *message*; the top matches are
+        sent in their original order.
+        """
+        turns = self._turns()
+        if len(turns) <= _RECENT_TURNS + _RECALLED_TURNS:
+            return list(self._history), True
+
+        older, recent = turns[:-_RECENT_TURNS], turns[-_RECENT_TURNS:]
+        query = set(_WORD_RE.findall(message.lower()))
+        overlap = [
+            len(query.intersection(_WORD_RE.findall(" ".join(m["content"] for m in t).lower())))
+            for t in older
+        ]
+        ranked = sorted(range(len(older)), key=overlap.__getitem__, reverse=True)
+        keep = sorted(ranked[:_RECALLED_TURNS])
+        return [m for i in keep for m in older[i]] + [m for t in recent for m in t], False
 
     # ------------------------------------------------------------------
     # System prompt construction
@@ -128,39 +251,31 @@ class PeakFormAgent:
                 return "### Nutrition: no data available"
 
             cutoff = week_end - pd.Timedelta(days=30)
-            df = df[df["date"] >= cutoff].copy()
-
-            cal_col = next(
-                (c for c in df.columns if "calorie" in c.lower() or "kcal" in c.lower()),
-                None,
-            )
-            prot_col = next(
-                (c for c in df.columns if "protein" in c.lower()), None
-            )
-            carb_col = next(
-                (c for c in df.columns if "carb" in c.lower()), None
-            )
-            fat_col = next(
-                (c for c in df.columns if "fat" in c.lower() and "pct" not in c.lower()),
-                None,
-            )
+            df = df[df["date"] >= cutoff]
 
-            def _v(row, col):
-                if col and col in row.index and pd.notna(row[col]):
-                    return f"{float(row[col]):.0f}"
-                return "—"
+            alias = mf_data.col_alias
+            value_cols = (alias["calories"], alias["protein"], alias["carbs"], alias["fat"])
+            older, recent = _split_detail(df, week_end)
 
             lines = [
                 "### Nutrition log (last 30 days)",
                 "Date | Calories | Protein (g) | Carbs (g) | Fat (g)",
                 "--- | --- | --- | --- | ---",
             ]
-            for _, row in df.iterrows():
-                lines.append(
-                    f"{row['date'].strftime('%Y-%m-%d')} | "
-                    f"{_v(row, cal_col)} | {_v(row, prot_col)} | "
-                    f"{_v(row, carb_col)} | {_v(row, fat_col)}"
-                )
+            if not older.empty:
+                # Earlier weeks as one row of daily averages each
+                present = list(dict.fromkeys(c for c in value_cols if c))
+                weekly = older.groupby(_week_of(older["date"]))[present].mean()
+                cols = [
+                    [f"Week of {d:%Y-%m-%d} (daily avg)" for d in weekly.index],
+                    *(_fmt_col(weekly, c, ".0f") for c in value_cols),
+                ]
+                lines.extend(" | ".join(cells) for cells in zip(*cols))
+            cols = [
+                recent["date"].dt.strftime("%Y-%m-%d").tolist(),
+                *(_fmt_col(recent, c, ".0f") for c in value_cols),
+            ]
+            lines.extend(" | ".join(cells) for cells in zip(*cols))
             return "\n".join(lines)
         except Exception as exc:
             return f"### Nutrition: error reading data ({exc})"
@@ -191,18 +306,12 @@ class PeakFormAgent:
                 "Date | Scale (lbs) | Trend (lbs)",
                 "--- | --- | ---",
             ]
-            for dt, row in merged.iterrows():
-                s = (
-                    f"{float(row['scale']):.1f}"
-                    if "scale" in row.index and pd.notna(row.get("scale"))
-                    else "—"
-                )
-                t = (
-                    f"{float(row['trend']):.1f}"
-                    if "trend" in row.index and pd.notna(row.get("trend"))
-                    else "—"
-                )
-                lines.append(f"{dt.strftime('%Y-%m-%d')} | {s} | {t}")
+            cols = [
+                merged.index.strftime("%Y-%m-%d").tolist(),
+                _fmt_col(merged, "scale", ".1f"),
+                _fmt_col(merged, "trend", ".1f"),
+            ]
+            lines.extend(" | ".join(cells) for cells in zip(*cols))
             return "\n".join(lines)
         except Exception as exc:
             return f"### Weight: error reading data ({exc})"
@@ -210,6 +319,7 @@ class PeakFormAgent:
     @staticmethod
     def _activities_table(garmin_data, week_end: pd.Timestamp) -> str:
         try:
+            from peakform.config import RUNNING_ACTIVITY_TYPES
             from peakform.parsers.garmin import _decimal_minutes_to_mmss
 
             cutoff = week_end - pd.Timedelta(days=30)
@@ -217,34 +327,55 @@ class PeakFormAgent:
             if df.empty:
                 return "### Activities: no data available"
 
-            df = df[(df["date"] >= cutoff) & (df["date"] <= week_end)].copy()
+            df = df[(df["date"] >= cutoff) & (df["date"] <= week_end)]
             if df.empty:
                 return "### Activities: none in last 30 days"
 
-            def _f(val, fmt=".1f"):
-                try:
-                    return f"{float(val):{fmt}}" if pd.notna(val) else "—"
-                except (TypeError, ValueError):
-                    return "—"
+            older, df = _split_detail(df, week_end)
 
-            lines = [
-                "### Activity log (last 30 days)",
+            lines = ["### Activity log (last 30 days)"]
+            if not older.empty:
+                # Earlier weeks as one summary line each
+                is_run = (
+                    older["activity_type"].isin(RUNNING_ACTIVITY_TYPES)
+                    if "activity_type" in older.columns
+                    else pd.Series(False, index=older.index)
+                )
+                for wk, acts in older.groupby(_week_of(older["date"])):
+                    runs = acts[is_run[acts.index]]
+                    line = f"- Week of {wk:%Y-%m-%d}: {len(acts)} activities, {len(runs)} runs"
+                    if len(runs) and "distance_mi" in runs.columns:
+                        miles = pd.to_numeric(runs["distance_mi"], errors="coerce").sum()
+                        line += f", {miles:.1f} mi"
+                    if "avg_pace" in runs.columns and runs["avg_pace"].notna().any():
+                        line += f", avg pace {_decimal_minutes_to_mmss(runs['avg_pace'].mean())}/mi"
+                    lines.append(line)
+                lines.append("")
+            lines += [
                 "Date | Type | Distance (mi) | Pace (min/mi) | Avg HR | Duration (min)",
                 "--- | --- | --- | --- | --- | ---",
             ]
-            for _, row in df.iterrows():
-                pace_raw = row.get("avg_pace")
-                pace = _decimal_minutes_to_mmss(pace_raw) if pd.notna(pace_raw) else "—"
-                dur_sec = row.get("duration")
-                dur = f"{float(dur_sec) / 60:.0f}" if pd.notna(dur_sec) else "—"
-                lines.append(
-                    f"{row['date'].strftime('%Y-%m-%d')} | "
-                    f"{str(row.get('activity_type', '—'))} | "
-                    f"{_f(row.get('distance_mi'))} | "
-                    f"{pace} | "
-                    f"{_f(row.get('avg_hr'), '.0f')} | "
-                    f"{dur}"
-                )
+            n = len(df)
+            pace = (
+                [
+                    _decimal_minutes_to_mmss(v) if pd.notna(v) else "—"
+                    for v in df["avg_pace"].tolist()
+                ]
+                if "avg_pace" in df.columns else ["—"] * n
+            )
+            kind = (
+                [str(v) if pd.notna(v) else "—" for v in df["activity_type"].tolist()]
+                if "activity_type" in df.columns else ["—"] * n
+            )
+            cols = [
+                df["date"].dt.strftime("%Y-%m-%d").tolist(),
+                kind,
+                _fmt_col(df, "distance_mi", ".1f"),
+                pace,
+                _fmt_col(df, "avg_hr", ".0f"),
+                _fmt_col(df, "duration", ".0f", div=60),
+            ]
+            lines.extend(" | ".join(cells) for cells in zip(*cols))
             return "\n".join(lines)
         except Exception as exc:
             return f"### Activities: error reading data ({exc})"
@@ -165,6 +165,9 @@ class GarminData:
     def __init__(self, filepath: str):
         self._filepath = filepath
         self._raw: pd.DataFrame = self._load(filepath)
+        # Row masks reused by every filtered view below (the frame never changes)
+        self._run_mask = self._raw["activity_type"].isin(RUNNING_ACTIVITY_TYPES).to_numpy()
+        self._trail_mask = self._raw["is_trail"].to_numpy(dtype=bool)
 
     def _load(self, filepath: str) -> pd.DataFrame:
         df = pd.read_csv(filepath, low_memory=False)
@@ -233,21 +236,17 @@ class GarminData:
     @property
     def runs(self) -> pd.DataFrame:
         """All running activities (road + trail + treadmill)."""
-        mask = self._raw["activity_type"].isin(RUNNING_ACTIVITY_TYPES)
-        return self._raw[mask].copy()
+        return self._raw[self._run_mask].copy()
 
     @property
     def flat_runs(self) -> pd.DataFrame:
         """Runs where total ascent < 500 ft (excludes trail/mountain runs)."""
-        runs = self.runs
-        mask = (runs["is_trail"] == False)  # noqa: E712
-        return runs[mask].copy()
+        return self._raw[self._run_mask & ~self._trail_mask].copy()
 
     @property
     def trail_runs(self) -> pd.DataFrame:
         """Runs where total ascent >= 500 ft."""
-        runs = self.runs
-        return runs[runs["is_trail"] == True].copy()  # noqa: E712
+        return self._raw[self._run_mask & self._trail_mask].copy()
 
     @property
     def strength_sessions(self) -> pd.DataFrame:
@@ -266,12 +265,11 @@ class GarminData:
     def runs_in_window(
         self, start: pd.Timestamp, end: pd.Timestamp, trail_only: bool = False
     ) -> pd.DataFrame:
-        df = self.runs
-        mask = (df["date"] >= start) & (df["date"] <= end)
-        df = df[mask].copy()
+        dates = self._raw["date"]
+        mask = self._run_mask & ((dates >= start) & (dates <= end)).to_numpy()
         if trail_only:
-            df = df[df["is_trail"] == True]  # noqa: E712
-        return df
+            mask &= self._trail_mask
+        return self._raw[mask].copy()
 
 
 def load(filepath: str) -> GarminData:
@@ -7,6 +7,7 @@ numeric coercion, and returns tidy DataFrames per sheet.
 from __future__ import annotations
 
 import re
+import threading
 from datetime import datetime, date
 from typing import Dict, Optional
 
@@ -242,6 +243,20 @@ def _parse_exercises_heaviest(wb: openpyxl.Workbook) -> pd.DataFrame:
 # Public API
 # ---------------------------------------------------------------------------
 
+_PARSE_LOCK = threading.Lock()
+_UNSET = object()  # lazily-resolved attribute not computed yet
+
+
+def _match_col(columns, *keywords, exclude: Optional[str] = None):
+    """First column containing any keyword (keywords in priority order)."""
+    for kw in keywords:
+        for c in columns:
+            name = str(c).lower()
+            if kw in name and not (exclude and exclude in name):
+                return c
+    return None
+
+
 class MacroFactorData:
     """Container for all parsed MacroFactor sheets."""
 
@@ -251,10 +266,17 @@ class MacroFactorData:
             filepath, data_only=True, read_only=True
         )
         self._sheets: Dict[str, pd.DataFrame] = {}
+        # Read from chart worker threads without _PARSE_LOCK; the lookup is
+        # idempotent, so a racing duplicate computation is harmless.
+        self._col_alias = _UNSET
 
     def _get(self, sheet_name: str, parser_fn) -> pd.DataFrame:
         if sheet_name not in self._sheets:
-            self._sheets[sheet_name] = parser_fn(self.wb)
+            # Sheets may be requested from worker threads (chart building);
+            # the read-only workbook must only be walked by one at a time.
+            with _PARSE_LOCK:
+                if sheet_name not in self._sheets:
+                    self._sheets[sheet_name] = parser_fn(self.wb)
         return self._sheets[sheet_name]
 
     @property
@@ -293,6 +315,28 @@ class MacroFactorData:
     def exercises_heaviest(self) -> pd.DataFrame:
         return self._get(SHEET_EXERCISES_HEAVIEST, _parse_exercises_heaviest)
 
+    @property
+    def col_alias(self) -> Dict[str, Optional[str]]:
+        """Calories & Macros column names by role, resolved once per file.
+
+        Keys are ``calories``, ``protein``, ``carbs`` and ``fat``; a value is
+        None when the export has no matching column.
+        """
+        if self._col_alias is _UNSET:
+            cols = self.calories_macros.columns
+            self._col_alias = {
+                "calories": _match_col(cols, "calorie", "kcal", "energy"),
+                "protein": _match_col(cols, "protein"),
+                "carbs": _match_col(cols, "carb"),
+                "fat": _match_col(cols, "fat", exclude="pct"),
+            }
+        return self._col_alias
+
+    @property
+    def calorie_col(self) -> Optional[str]:
+        """Name of the calorie column in Calories & Macros, or None if absent."""
+        return self.col_alias["calories"]
+
     def available_sheets(self):
         return self.wb.sheetnames
 
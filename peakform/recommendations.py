@@ -11,7 +11,11 @@ Phases
 
 from __future__ import annotations
 
-import os
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 
 import anthropic
@@ -367,9 +371,18 @@ _MODEL_TEMPLATE  = "claude-sonnet-4-5-20250929"    # long structured output for
 _MODEL_CHAT      = "claude-haiku-4-5-20251001"     # fast conversational responses
 
 
+@functools.lru_cache(maxsize=None)
+def client(api_key: str) -> anthropic.Anthropic:
+    """One client (and HTTP connection pool) per API key, shared by all calls.
+
+    The app's coach agent is built on this same client, so Smart Plan and
+    chat share one connection pool.
+    """
+    return anthropic.Anthropic(api_key=api_key)
+
+
 def _call(prompt: str, api_key: str, model: str, max_tokens: int = 4096) -> str:
-    client = anthropic.Anthropic(api_key=api_key)
-    msg = client.messages.create(
+    msg = client(api_key).messages.create(
         model=model,
         max_tokens=max_tokens,
         messages=[{"role": "user", "content": prompt}],
@@ -377,6 +390,49 @@ def _call(prompt: str, api_key: str, model: str, max_tokens: int = 4096) -> str:
     return msg.content[0].text
 
 
+# Responses for the phase 2–4 generators are kept briefly in memory, keyed on
+# the full prompt, so revisiting a phase with unchanged inputs replays the
+# earlier answer instead of paying for the same call again.  Nothing is
+# written to disk; entries expire after _CACHE_TTL_S and the oldest are
+# evicted past _CACHE_MAX_ENTRIES.
+_CACHE_TTL_S = 60 * 60
+_CACHE_MAX_ENTRIES = 32
+_CACHE: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def _cache_key(prompt: str, api_key: str, model: str, max_tokens: int) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    for part in (api_key, model, str(max_tokens), prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _cached_call(
+    prompt: str, api_key: str, model: str, max_tokens: int = 4096, refresh: bool = False
+) -> str:
+    """``_call`` memoised on (api_key, model, max_tokens, prompt).
+
+    ``refresh=True`` skips the lookup (an explicit "regenerate") and stores
+    the new answer in place of the old one.
+    """
+    key = _cache_key(prompt, api_key, model, max_tokens)
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        for k in [k for k, (t, _) in _CACHE.items() if now - t > _CACHE_TTL_S]:
+            del _CACHE[k]
+        if not refresh and key in _CACHE:
+            return _CACHE[key][1]
+    text = _call(prompt, api_key, model, max_tokens)
+    with _CACHE_LOCK:
+        _CACHE[key] = (time.monotonic(), text)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > _CACHE_MAX_ENTRIES:
+            _CACHE.popitem(last=False)
+    return text
+
+
 def run_analysis(
     state: InterviewState,
     mf_data,
@@ -384,6 +440,7 @@ def run_analysis(
     week_start,
     week_end,
     api_key: str,
+    refresh: bool = False,
 ) -> str:
     from peakform.analyzers import running as _r, nutrition as _n, body_comp as _b
 
@@ -391,18 +448,21 @@ def run_analysis(
     na = _n.analyze(mf_data, week_start, week_end, weekly_mileage=ra.current.total_miles)
     ba = _b.analyze(mf_data, week_start, week_end, avg_daily_deficit=na.avg_daily_deficit)
 
-    return _call(build_analysis_prompt(state, ra, na, ba), api_key, _MODEL_ANALYSIS)
+    return _cached_call(
+        build_analysis_prompt(state, ra, na, ba), api_key, _MODEL_ANALYSIS, refresh=refresh
+    )
 
 
-def run_proposal(state: InterviewState, api_key: str) -> str:
-    return _call(
+def run_proposal(state: InterviewState, api_key: str, refresh: bool = False) -> str:
+    return _cached_call(
         build_proposal_prompt(state.analysis_text, state),
         api_key,
         _MODEL_ANALYSIS,
+        refresh=refresh,
     )
 
 
-def run_template(state: InterviewState, api_key: str) -> str:
+def run_template(state: InterviewState, api_key: str, refresh: bool = False) -> str:
     if state.use_new_meals:
         meal_instruction = (
             "Suggest new high-protein, vegetarian-friendly meals beyond the standard rotation. "
@@ -413,11 +473,12 @@ def run_template(state: InterviewState, api_key: str) -> str:
             "Use Ben's existing meal rotation only. Adjust portion sizes where needed to hit daily targets. "
             "Do not introduce new meals."
         )
-    return _call(
+    return _cached_call(
         build_template_prompt(state, meal_instruction),
         api_key,
         _MODEL_TEMPLATE,
         max_tokens=8000,
+        refresh=refresh,
     )
 
 
@@ -427,8 +488,6 @@ def run_template(state: InterviewState, api_key: str) -> str:
 
 def run_phase_chat(phase: int, state: InterviewState, user_message: str, api_key: str) -> str:
     """Return a coach reply for an in-phase Smart Plan conversation."""
-    client = anthropic.Anthropic(api_key=api_key)
-
     if phase == 2:
         system = f"""You are Ben's elite AI performance coach at PeakForm, currently in the \
 Performance Analysis phase.
@@ -483,7 +542,7 @@ regenerate with those changes applied
         return "Chat is not available for this phase."
 
     msgs = history + [{"role": "user", "content": user_message}]
-    response = client.messages.create(
+    response = client(api_key).messages.create(
         model=_MODEL_CHAT,
         max_tokens=1024,
         system=system,